@@ -1,19 +1,94 @@
 #!/usr/bin/env python3
 
+import hashlib
+import struct
+import threading
+import time
+from collections import OrderedDict
 from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+class CipherCache:
+    """
+    Cache LRU thread-safe untuk objek AES mode ECB yang sudah siap (ekspansi key sudah dilakukan)
+    Ketentuan:
+    - entri disimpan dengan kunci SHA-256 dari key, bukan key aslinya
+    - entri kedaluwarsa ttl detik setelah dibuat, sehingga key schedule tidak tinggal di memori selamanya
+    - objek ECB tidak punya state antar panggilan, jadi satu objek aman dipakai bersama beberapa thread
+    """
+
+    def __init__(self, maxsize=32, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Mengembalikan objek AES ECB untuk key (byte), dibuat baru jika belum ada atau kedaluwarsa"""
+        digest = hashlib.sha256(key).digest()
+        now = time.monotonic()
+        with self.lock:
+            # Buang semua entri kedaluwarsa, bukan hanya entri key ini (paling banyak maxsize entri)
+            for expired in [d for d, (_, created) in self.entries.items() if now - created >= self.ttl]:
+                del self.entries[expired]
+
+            entry = self.entries.get(digest)
+            if entry is not None:
+                self.entries.move_to_end(digest)
+                return entry[0]
+
+            aes_instance = AES.new(key, AES.MODE_ECB)
+            self.entries[digest] = (aes_instance, now)
+            self.entries.move_to_end(digest)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return aes_instance
+
+    def clear(self):
+        """Menghapus semua entri"""
+        with self.lock:
+            self.entries.clear()
+
+# Cache bersama untuk semua AESCipher dalam proses ini
+CIPHER_CACHE = CipherCache()
 
 class AESCipher:
     """
     Kelas AESCipher untuk enkripsi/dekripsi teks menggunakan algoritma AES
     Ketentuan:
     - panjang key: harus 16 karakter
-    - panjang pesan: harus kelipatan 16
+    - panjang pesan: harus kelipatan 16 (hanya untuk encrypt/decrypt mode ECB;
+      encrypt_stream/decrypt_stream menerima panjang berapa pun)
     """
+
+    # Format stream: STREAM_MAGIC, prefix nonce acak, lalu frame berisi panjang 32 bit
+    # (bit teratas menandai frame terakhir), ciphertext GCM dan tag 16 byte
+    STREAM_MAGIC = b'TMS1'
+    NONCE_PREFIX_SIZE = 8
+    TAG_SIZE = 16
+    FRAME_HEADER = '>I'
+    FINAL_FLAG = 0x80000000
+    # Ukuran plaintext maksimum per frame; chunk yang lebih besar dipecah
+    CHUNK_SIZE = 64 * 1024
     
     def __init__(self, key):
         """Inisialisasi cipher dengan key enkripsi"""
         self.key = key.encode('utf-8')
     
+    def encrypt_bytes(self, msg):
+        """
+        Mengenkripsi pesan menggunakan key
+        Argumen:
+            msg: pesan teks biasa yang akan dienkripsi
+        Mengembalikan:
+            Data terenkripsi dalam bentuk byte mentah
+        """
+        # Mengambil objek AES cipher mode ECB dari cache
+        aes_instance = CIPHER_CACHE.get(self.key)
+        
+        # Melakukan enkripsi
+        return aes_instance.encrypt(msg.encode('utf-8'))
+    
     def encrypt(self, msg):
         """
         Mengenkripsi pesan menggunakan key
@@ -22,26 +97,159 @@ class AESCipher:
         Mengembalikan:
             String heksadesimal dari data terenkripsi
         """
-        # Membuat objek AES cipher baru dalam mode ECB
-        aes_instance = AES.new(self.key, AES.MODE_ECB)
-        
         # Melakukan enkripsi dan mengubah hasilnya ke heksadesimal
-        encrypted_data = aes_instance.encrypt(msg.encode('utf-8'))
-        return encrypted_data.hex()
+        return self.encrypt_bytes(msg).hex()
     
     def decrypt(self, cipherText):
         """
         Mendekripsi ciphertext menggunakan key
         Argumen:
-            cipherText: string heksadesimal dari data terenkripsi
+            cipherText: string heksadesimal dari encrypt, byte mentah dari encrypt_bytes,
+                atau byte dari encrypt_stream
         Mengembalikan:
             Pesan hasil dekripsi dalam bentuk byte
         """
-        # Membuat objek AES cipher baru dalam mode ECB untuk dekripsi
-        aes_instance = AES.new(self.key, AES.MODE_ECB)
-        
-        # Mengubah hex ke byte lalu melakukan dekripsi
-        return aes_instance.decrypt(bytes.fromhex(cipherText))
+        return self.decrypt_many([cipherText])[0]
+
+    def decrypt_many(self, cipherTexts):
+        """
+        Mendekripsi banyak ciphertext sekaligus dengan satu objek cipher
+        Argumen:
+            cipherTexts: iterable berisi string heksadesimal, byte mentah ECB atau byte format stream
+        Mengembalikan:
+            List pesan hasil dekripsi dalam bentuk byte, sesuai urutan masukan; data format stream
+            didekripsi dan diverifikasi dengan decrypt_stream (ValueError jika rusak)
+        """
+        # Mengambil objek AES cipher mode ECB dari cache untuk dekripsi
+        aes_instance = CIPHER_CACHE.get(self.key)
+
+        results = []
+        for c in cipherTexts:
+            if self.is_stream(c):
+                results.append(b''.join(self.decrypt_stream([c])))
+            else:
+                # Mengubah hex ke byte (format lama) lalu melakukan dekripsi
+                results.append(aes_instance.decrypt(bytes.fromhex(c) if isinstance(c, str) else c))
+        return results
+
+    @classmethod
+    def is_stream(cls, data):
+        """Memeriksa apakah data (byte) diawali header format encrypt_stream"""
+        return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(cls.STREAM_MAGIC)]) == cls.STREAM_MAGIC
+
+    def _frame_cipher(self, prefix, counter, frame_header):
+        """Membuat objek AES-GCM untuk satu frame; nonce = prefix + nomor frame"""
+        if counter >= 1 << 32:
+            raise ValueError("stream has too many chunks")
+        aes_instance = AES.new(self.key, AES.MODE_GCM, nonce=prefix + struct.pack('>I', counter))
+        # Header frame ikut diautentikasi sehingga penanda frame terakhir tidak bisa diubah
+        aes_instance.update(frame_header)
+        return aes_instance
+
+    def _split_chunks(self, chunks):
+        """Memecah chunk (teks atau byte) menjadi potongan tidak kosong paling besar CHUNK_SIZE"""
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            view = memoryview(chunk).cast('B')
+            for start in range(0, len(view), self.CHUNK_SIZE):
+                # Disalin karena pemanggil boleh memakai ulang buffer chunk setelah iterasi berikutnya
+                yield bytes(view[start:start + self.CHUNK_SIZE])
+
+    def encrypt_stream(self, chunks):
+        """
+        Mengenkripsi aliran chunk dengan AES-GCM per frame tanpa menampung seluruh pesan
+        Argumen:
+            chunks: iterable berisi teks atau byte dengan panjang berapa pun (tanpa padding)
+        Mengembalikan:
+            Generator byte: header stream lalu satu frame per potongan; gabungan hasilnya
+            bisa langsung diberikan ke dct_steg.embed_bytes
+        """
+        prefix = get_random_bytes(self.NONCE_PREFIX_SIZE)
+        yield self.STREAM_MAGIC + prefix
+
+        # Satu potongan ditahan supaya frame terakhir bisa diberi penanda
+        counter = 0
+        pending = None
+        for piece in self._split_chunks(chunks):
+            if pending is not None:
+                yield self._encrypt_frame(prefix, counter, pending, False)
+                counter += 1
+            pending = piece
+        yield self._encrypt_frame(prefix, counter, b'' if pending is None else pending, True)
+
+    def _encrypt_frame(self, prefix, counter, plaintext, final):
+        """Mengenkripsi satu frame lengkap dengan header dan tag"""
+        frame_header = struct.pack(self.FRAME_HEADER, len(plaintext) | (self.FINAL_FLAG if final else 0))
+        ciphertext, tag = self._frame_cipher(prefix, counter, frame_header).encrypt_and_digest(plaintext)
+        return frame_header + ciphertext + tag
+
+    def decrypt_stream(self, chunks):
+        """
+        Mendekripsi dan memverifikasi data dari encrypt_stream secara bertahap
+        Argumen:
+            chunks: iterable berisi byte hasil encrypt_stream, dipotong di mana saja
+        Mengembalikan:
+            Generator plaintext (byte) per frame; ValueError jika data diubah,
+            terpotong atau bukan format stream
+        """
+        buffer = bytearray()
+        chunks = iter(chunks)
+
+        def fill(size):
+            # Tambah buffer sampai minimal size byte; False jika data habis
+            while len(buffer) < size:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return False
+                buffer.extend(chunk)
+            return True
+
+        start = len(self.STREAM_MAGIC) + self.NONCE_PREFIX_SIZE
+        if not fill(start) or bytes(buffer[:len(self.STREAM_MAGIC)]) != self.STREAM_MAGIC:
+            raise ValueError("not an encrypted stream")
+        prefix = bytes(buffer[len(self.STREAM_MAGIC):start])
+        del buffer[:start]
+
+        header_size = struct.calcsize(self.FRAME_HEADER)
+        counter = 0
+        while True:
+            if not fill(header_size):
+                raise ValueError("encrypted stream is truncated")
+            frame_header = bytes(buffer[:header_size])
+            length, = struct.unpack(self.FRAME_HEADER, frame_header)
+            final = bool(length & self.FINAL_FLAG)
+            length &= ~self.FINAL_FLAG
+            if length > self.CHUNK_SIZE:
+                raise ValueError("invalid stream frame length")
+
+            end = header_size + length + self.TAG_SIZE
+            if not fill(end):
+                raise ValueError("encrypted stream is truncated")
+            aes_instance = self._frame_cipher(prefix, counter, frame_header)
+            plaintext = aes_instance.decrypt_and_verify(bytes(buffer[header_size:end - self.TAG_SIZE]),
+                                                        bytes(buffer[end - self.TAG_SIZE:end]))
+            del buffer[:end]
+            counter += 1
+            yield plaintext
+
+            if final:
+                break
+
+        if buffer or next(chunks, None):
+            raise ValueError("unexpected data after encrypted stream")
+
+    def decrypt_message(self, cipherText):
+        """
+        Mendekripsi pesan teks dari format stream atau format ECB lama
+        Argumen:
+            cipherText: byte dari encrypt_stream, atau ciphertext ECB (heksadesimal/byte)
+        Mengembalikan:
+            Pesan teks; spasi padding hanya dibuang untuk format ECB lama
+        """
+        if self.is_stream(cipherText):
+            return b''.join(self.decrypt_stream([cipherText])).decode('utf-8')
+        return self.decrypt(cipherText).decode('utf-8').rstrip()
 
 
 # Contoh penggunaan saat script dijalankan langsung
@@ -59,4 +267,9 @@ if __name__ == "__main__":
     
     # Mendekripsi pesan
     decrypted = cipher.decrypt(encrypted)
-    print(f"Decrypted: {decrypted}")
\ No newline at end of file
+    print(f"Decrypted: {decrypted}")
+
+    # Enkripsi bertahap dengan AES-GCM, tanpa padding
+    stream = b''.join(cipher.encrypt_stream([original_message, " dan seterusnya"]))
+    print(f"Stream: {stream.hex()}")
+    print(f"Decrypted stream: {b''.join(cipher.decrypt_stream([stream]))}")
\ No newline at end of file
@@ -7,9 +7,8 @@ import os
 from werkzeug.utils import secure_filename
 from dct import dct_steg
 from aes import AESCipher
-from psnr import calculate_psnr
-from ssim import calculate_ssim
-from robustness import RobustnessTest
+from quality import QualityEngine
+from robustness import ATTACKS, RobustnessTest
 
 app = Flask(__name__)
 app.secret_key = "temut_secret_key"
@@ -20,8 +19,12 @@ app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg'}
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'robustness'), exist_ok=True)
 
+# Engine metrik kualitas dengan buffer kerja yang dipakai ulang antar request
+quality_engine = QualityEngine()
+
 # Variabel global untuk menyimpan data sementara
 temp_image = None
+temp_image_path = None  # File di disk yang isinya sama dengan temp_image, dibaca sebagian saat decode
 temp_original_image = None  # Menyimpan gambar asli untuk perhitungan PSNR
 temp_output_path = None
 temp_cipher_text = None  # Menyimpan cipher text untuk robustness test
@@ -36,7 +39,7 @@ def index():
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
-    global temp_image, temp_original_image
+    global temp_image, temp_original_image, temp_image_path
 
     if 'file' not in request.files:
         flash('No file part')
@@ -57,14 +60,16 @@ def upload_file():
         # Simpan gambar asli untuk perhitungan PSNR dan SSIM nanti
         temp_original_image = img.copy()
 
-        # Simpan gambar dalam memori
-        temp_image = img
+        # Simpan gambar dalam memori; selama belum di-encode, temp_image adalah objek gambar asli itu sendiri
+        # (dct_steg bekerja pada salinannya), sehingga encode bisa mengenali cover yang masih asli
+        temp_image = temp_original_image
 
         # Simpan file sementara
         filename = secure_filename(file.filename)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         with open(filepath, 'wb') as f:
             f.write(file_bytes)
+        temp_image_path = filepath
 
         original_filename = "original_image.png"
         original_path = os.path.join(app.config['UPLOAD_FOLDER'], original_filename)
@@ -78,7 +83,7 @@ def upload_file():
 
 @app.route('/encode', methods=['POST'])
 def encode():
-    global temp_image, temp_original_image, temp_output_path, temp_cipher_text
+    global temp_image, temp_original_image, temp_output_path, temp_cipher_text, temp_image_path
 
     if temp_image is None:
         flash('Please upload an image first')
@@ -91,25 +96,25 @@ def encode():
         flash('Key must be 16 characters')
         return redirect(url_for('index'))
 
-    if len(message) % 16 != 0:
-        message += (" " * (16 - len(message) % 16))
-
     try:
-        # Enkripsi pesan
+        # Enkripsi pesan dengan AES-GCM bertahap (tanpa padding)
         cipher = AESCipher(key)
-        cipher_text = cipher.encrypt(message)
+        cipher_text = b''.join(cipher.encrypt_stream([message]))
         
         # Simpan cipher_text untuk pengujian ketahanan
         temp_cipher_text = cipher_text
 
-        # Sisipkan ke gambar
+        # Sisipkan ke gambar sebagai byte mentah
         obj = dct_steg(temp_image)
-        obj.embed(cipher_text)
+        obj.embed_bytes(cipher_text)
         result_image = obj.image
 
-        # Hitung PSNR dan SSIM
-        psnr_value = calculate_psnr(temp_original_image, result_image)
-        ssim_value = calculate_ssim(temp_original_image, result_image)
+        # Hitung PSNR dan SSIM sekaligus; MSE hanya dari blok yang disisipi jika cover masih gambar asli.
+        # Jika cover sudah hasil encode sebelumnya, blok dari encode itu juga berbeda dari gambar asli
+        blocks = obj.touched_blocks() if temp_image is temp_original_image else None
+        quality = quality_engine.measure(temp_original_image, result_image, blocks)
+        psnr_value = quality['psnr']
+        ssim_value = quality['ssim']
 
         # Simpan hasil encode
         output_filename = "encoded_image.png"
@@ -119,6 +124,7 @@ def encode():
         
         # Update temp_image untuk operasi decode
         temp_image = result_image
+        temp_image_path = output_path
 
         flash(f'Message encoded successfully. PSNR: {psnr_value:.2f} dB, SSIM: {ssim_value:.4f}')
         return render_template('index.html',
@@ -148,13 +154,16 @@ def decode():
         return redirect(url_for('index'))
 
     try:
-        obj = dct_steg(temp_image)
-        cipher_text = obj.extract()
+        # Hanya baris gambar yang memuat payload yang didekode dari file
+        with dct_steg.open(temp_image_path) as obj:
+            cipher_text = obj.extract_bytes(key)
 
-        cipher = AESCipher(key)
-        decrypted_message = cipher.decrypt(cipher_text)
+        # Gambar format lama menyimpan ciphertext sebagai teks heksadesimal
+        if obj.version == dct_steg.FORMAT_LEGACY:
+            cipher_text = cipher_text.decode('ascii')
 
-        decoded_message = decrypted_message.decode('utf-8').rstrip()
+        cipher = AESCipher(key)
+        decoded_message = cipher.decrypt_message(cipher_text)
 
         flash('Message decoded successfully')
         return render_template('index.html',
@@ -177,6 +186,18 @@ def download():
     flash('No encoded image available for download')
     return redirect(url_for('index'))
 
+# Label tampilan, format parameter dan nama file gambar untuk setiap jenis serangan
+ROBUSTNESS_LABELS = {
+    'resize': ('Resize', lambda factor: f"{factor}x",
+               lambda factor: f"resize_{factor}.png"),
+    'gaussian': ('Gaussian Noise', lambda stddev: f"σ={stddev}",
+                 lambda stddev: f"gaussian_{stddev}.png"),
+    'salt_pepper': ('Salt & Pepper Noise', lambda density: f"{density*100}%",
+                    lambda density: f"salt_pepper_{int(density*100)}.png"),
+    'jpeg': ('JPEG Compression', lambda quality: f"Quality {quality}",
+             lambda quality: f"jpeg_{quality}.png"),
+}
+
 @app.route('/test_robustness', methods=['POST'])
 def test_robustness():
     global temp_image, temp_original_image, temp_cipher_text
@@ -199,86 +220,36 @@ def test_robustness():
     test_results = []
     
     try:
-        # Lakukan tes yang dipilih
-        if test_type == 'resize':
-            factors = [0.5, 0.75, 0.9, 1.1, 1.25, 1.5]
-            results = robustness.resize_test(factors)
-            
-            for factor, result in results.items():
-                # Simpan gambar yang diserang
-                img_filename = f"resize_{factor}.png"
-                img_path = os.path.join(app.config['UPLOAD_FOLDER'], 'robustness', img_filename)
-                cv2.imwrite(img_path, result['resized_image'])
-                
-                relative_path = f"uploads/robustness/{img_filename}"
-                
-                test_results.append({
-                    'type': 'Resize',
-                    'param': f"{factor}x",
-                    'success': result['success'],
-                    'message': result['message'] if result['success'] else result['error'],
-                    'image_path': relative_path
-                })
+        # Lakukan tes yang dipilih ('all' menjalankan semua jenis serangan)
+        if test_type == 'all':
+            spec = RobustnessTest.DEFAULT_SUITE
+        elif test_type in RobustnessTest.DEFAULT_SUITE:
+            spec = {test_type: RobustnessTest.DEFAULT_SUITE[test_type]}
+        else:
+            spec = {}
         
-        elif test_type == 'gaussian':
-            stddevs = [5, 10, 15, 20, 25]
-            results = robustness.noise_test('gaussian', stddevs)
+        # Hasil datang sesuai urutan selesai; gambar langsung disimpan begitu hasilnya ada
+        for family, param, result in robustness.run_suite(spec):
+            label, format_param, format_filename = ROBUSTNESS_LABELS[family]
+            image_key = ATTACKS[family][1]
             
-            for stddev, result in results.items():
-                # Simpan gambar yang diserang
-                img_filename = f"gaussian_{stddev}.png"
-                img_path = os.path.join(app.config['UPLOAD_FOLDER'], 'robustness', img_filename)
-                cv2.imwrite(img_path, result['noisy_image'])
-                
-                relative_path = f"uploads/robustness/{img_filename}"
-                
-                test_results.append({
-                    'type': 'Gaussian Noise',
-                    'param': f"σ={stddev}",
-                    'success': result['success'],
-                    'message': result['message'] if result['success'] else result['error'],
-                    'image_path': relative_path
-                })
-        
-        elif test_type == 'salt_pepper':
-            densities = [0.01, 0.02, 0.05, 0.1, 0.15]
-            results = robustness.noise_test('salt_pepper', densities)
+            # Simpan gambar yang diserang
+            img_filename = format_filename(param)
+            img_path = os.path.join(app.config['UPLOAD_FOLDER'], 'robustness', img_filename)
+            cv2.imwrite(img_path, result[image_key])
             
-            for density, result in results.items():
-                # Simpan gambar yang diserang
-                img_filename = f"salt_pepper_{int(density*100)}.png"
-                img_path = os.path.join(app.config['UPLOAD_FOLDER'], 'robustness', img_filename)
-                cv2.imwrite(img_path, result['noisy_image'])
-                
-                relative_path = f"uploads/robustness/{img_filename}"
-                
-                test_results.append({
-                    'type': 'Salt & Pepper Noise',
-                    'param': f"{density*100}%",
-                    'success': result['success'],
-                    'message': result['message'] if result['success'] else result['error'],
-                    'image_path': relative_path
-                })
-        
-        elif test_type == 'jpeg':
-            qualities = [100, 90, 80, 70, 60, 50, 40, 30]
-            results = robustness.jpeg_compression_test(qualities)
+            relative_path = f"uploads/robustness/{img_filename}"
             
-            for quality, result in results.items():
-                # Simpan gambar yang diserang
-                img_filename = f"jpeg_{quality}.png"
-                img_path = os.path.join(app.config['UPLOAD_FOLDER'], 'robustness', img_filename)
-                cv2.imwrite(img_path, result['compressed_image'])
-                
-                relative_path = f"uploads/robustness/{img_filename}"
-                
-                test_results.append({
-                    'type': 'JPEG Compression',
-                    'param': f"Quality {quality}",
-                    'success': result['success'],
-                    'message': result['message'] if result['success'] else result['error'],
-                    'image_path': relative_path
-                })
+            results_data[family, param] = {
+                'type': label,
+                'param': format_param(param),
+                'success': result['success'],
+                'message': result['message'] if result['success'] else result['error'],
+                'image_path': relative_path
+            }
+        
+        # Tampilkan dalam urutan parameter, bukan urutan selesai
+        test_results = [results_data[family, param] for family, params in spec.items() for param in params]
         
         # Hitung tes yang berhasil
         successful_tests = sum(1 for result in test_results if result['success'])
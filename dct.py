@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
+import functools
+import hashlib
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
+from png_rows import png_rows
 
-class AppError(BaseException):
+class AppError(Exception):
   pass
 
 def i2bin(i, l):
@@ -19,22 +25,143 @@ def i2bin(i, l):
 def char2bin(c):
   return i2bin(ord(c), 8)
 
+# matriks basis DCT-II ortonormal n x n, sama dengan yang dipakai cv2.dct
+def dct_matrix(n):
+  k = np.arange(n)
+  matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2.0 / n)
+  matrix[0] /= np.sqrt(2.0)
+  return matrix
+
+DCT_MATRIX = dct_matrix(8)
+
+# block_view mengubah gambar (..., H, W, C) menjadi view (..., blok_x, blok_y, C, 8, 8) tanpa menyalin data
+def block_view(image, size=8):
+  height, width, channels = image.shape[-3:]
+  rows, cols = height // size, width // size
+  view = image[..., :rows*size, :cols*size, :]
+  view = view.reshape(image.shape[:-3] + (rows, size, cols, size, channels))
+  lead = len(image.shape) - 3
+  axes = tuple(range(lead))
+  return view.transpose(axes + (lead, lead+2, lead+4, lead+1, lead+3))
+
+# block_grid mengembalikan (baris blok, kolom blok, channel, jumlah langkah) yang bisa dipakai untuk satu ukuran
+# gambar, dengan urutan langkah: channel berganti paling cepat, lalu kolom, lalu baris.
+# legacy=True meniru pointer next() lama: baris dan kolom blok terakhir tidak dipakai, dan blok terakhir dari
+# seluruh urutan juga tidak bisa dipakai karena next() sudah melempar "need larger image" saat menuju ke sana
+def block_grid(shape, legacy=False, size=8):
+  height, width, channels = shape[-3:]
+  rows, cols = height // size, width // size
+  if legacy and rows and cols:
+    rows, cols = max(1, (height - 1) // size), max(1, (width - 1) // size)
+
+  total = rows * cols * channels
+  if legacy:
+    total = max(0, total - 1)
+  return rows, cols, channels, total
+
+# koordinat (baris blok, kolom blok, channel) dari array nomor langkah, dihitung langsung tanpa indeks
+def grid_steps(shape, steps, legacy=False, size=8):
+  _, cols, channels, _ = block_grid(shape, legacy, size)
+  position = steps // channels
+  return position // cols, position % cols, steps % channels
+
+# block_index menghitung sekali lalu menyimpan koordinat semua langkah block_grid untuk satu ukuran gambar
+@functools.lru_cache(maxsize=8)
+def block_index(shape, legacy=False, size=8):
+  rows, cols, channels, total = block_grid(shape, legacy, size)
+
+  # tipe integer terkecil yang cukup, supaya indeks gambar besar tetap kecil di memori
+  dtype = np.min_scalar_type(max(rows, cols, channels))
+  index = (np.repeat(np.arange(rows, dtype=dtype), cols * channels),
+           np.tile(np.repeat(np.arange(cols, dtype=dtype), channels), rows),
+           np.tile(np.arange(channels, dtype=dtype), rows * cols))
+  index = tuple(a[:total] for a in index)
+  for a in index:
+    a.setflags(write=False)
+  return index
+
+# step_permutation menghasilkan urutan acak 0..count-1 dari digest kunci; disimpan di cache LRU terbatas supaya
+# gambar lain berukuran sama dengan kunci yang sama tidak perlu membuat ulang permutasinya. Cache hanya menyimpan
+# digest, bukan kunci aslinya
+@functools.lru_cache(maxsize=8)
+def step_permutation(digest, count):
+  rng = np.random.default_rng(np.frombuffer(digest, dtype=np.uint32))
+  permutation = rng.permutation(count).astype(np.min_scalar_type(max(count - 1, 0)))
+  permutation.setflags(write=False)
+  return permutation
+
+# pola basis 8x8 dari koefisien (u, v): nilai koefisien satu blok sama dengan jumlah perkalian blok dengan pola ini
+def coeff_basis(u, v):
+  return np.outer(DCT_MATRIX[u], DCT_MATRIX[v])
+
+# matriks (64, k) berisi pola basis setiap koefisien pada layout, untuk membaca k koefisien sekaligus
+@functools.lru_cache(maxsize=None)
+def layout_basis(layout):
+  basis = np.stack([coeff_basis(u, v).ravel() for u, v in layout], axis=1)
+  basis.setflags(write=False)
+  return basis
+
+# DCT maju untuk seluruh tumpukan blok (N, 8, 8) sekaligus
+def block_dct(blocks):
+  return DCT_MATRIX @ blocks @ DCT_MATRIX.T
+
+# DCT terbalik untuk seluruh tumpukan koefisien (N, 8, 8) sekaligus
+def block_idct(coeffs):
+  return DCT_MATRIX.T @ coeffs @ DCT_MATRIX
+
 # DCT digunakan untuk melakukan manipulasi gambar terutama penyisipan pesan rahasia menggunakan metode DCT (Discrete Cosine Transform)
 class dct_steg():
 
  # sebelum menyisipkan pesan rahasia pada gambar, kita perlu mengetahui sel mana yang digunakan atau akan digunakan untuk menyimpan pesan rahasia, untuk mencapainya, kita akan menggunakan 16 sel pertama untuk menyimpan panjang, nilai ini akan dikonversi ke biner dan tidak lebih dari 16 bit yang berarti panjang pesan maksimum adalah 2^16 = 65536
   MAX_BIT_LENGTH = 16
+  # nilai panjang 16 bit yang dicadangkan sebagai penanda: setelahnya ada byte versi format, bukan teks lama
+  FORMAT_MARKER = 0xFFFF
+  # format lama: panjang 16 bit lalu teks (ciphertext heksadesimal dari aplikasi)
+  FORMAT_LEGACY = 0
+  # format biner tanpa checksum (hanya dibaca): penanda, versi 8 bit, panjang 16 bit lalu byte mentah
+  FORMAT_BINARY = 1
+  # format dengan checksum: penanda, versi 8 bit, flags 8 bit, panjang 32 bit, CRC32 payload lalu 16 bit bawah
+  # CRC32 dari field header sebelumnya, sehingga gambar tanpa payload bisa ditolak hanya dari blok header
+  FORMAT_CHECKED = 2
+  CHECKED_HEADER = '>HBBII'
+  HEADER_CHECK = '>H'
+  # langkah sependek ini (misalnya header) dihitung langsung tanpa membangun block_index untuk seluruh gambar
+  DIRECT_INDEX_STEPS = 256
   # Ukuran blok DCT
   BLOCK_SIZE = 8
   # Faktor kuantisasi untuk koefisien DCT
   QUANT_FACTOR = 25
   # Koefisien mana di blok DCT yang akan dimodifikasi (menghindari koefisien DC dan komponen frekuensi rendah)
   COEFF_INDEX = 5
+  # jarak ke bilangan bulat (atau ke batas pembulatan .5) di mana hasil float64 bisa berbeda pembulatan dengan float32 cv2
+  EXACT_TOLERANCE = 1e-3
+  # jumlah blok minimum per potongan kerja paralel; di bawah ini overhead thread lebih besar dari hasilnya
+  PARALLEL_MIN_BLOCKS = 4096
+  # posisi koefisien yang membawa bit di setiap blok, dipilih dari pita frekuensi tengah urutan zig-zag.
+  # Nomor layout disimpan di 4 bit bawah flags header; header sendiri selalu memakai layout 0.
+  # Jumlah koefisien setiap layout membagi 8, sehingga setiap byte payload tepat mengisi sejumlah blok
+  LAYOUTS = (
+    ((COEFF_INDEX, COEFF_INDEX),),
+    ((3, 4), (4, 3)),
+    ((2, 5), (3, 4), (4, 3), (5, 2)),
+    ((1, 6), (2, 5), (3, 4), (4, 3), (5, 2), (6, 1), (3, 5), (5, 3)),
+  )
+  LAYOUT_MASK = 0x0F
+  # bit flags header: langkah payload diacak dengan permutasi dari kunci (lihat set_key)
+  FLAG_PERMUTED = 0x10
 
-  def __init__(self, img):
+  # readonly=True memakai gambar masukan (uint8) apa adanya tanpa salinan float32; hanya bisa untuk extract
+  # band_rows=N (mode pita) mengubah gambar uint8 masukan langsung di tempat, misalnya np.memmap dari
+  # np.load(path, mmap_mode='r+'), dan hanya N baris blok yang sedang diproses yang dikonversi ke float32
+  # workers=N membagi blok menjadi potongan terpisah yang dikerjakan N thread sekaligus (NumPy melepas GIL),
+  # hasilnya identik dengan workers=1
+  def __init__(self, img, readonly=False, band_rows=None, workers=1):
     self.size_x, self.size_y, self.size_channel = img.shape
 
-    self.image = img.astype(np.float32)
+    self.init_state(readonly)
+    self.band_rows = band_rows
+    self.workers = workers
+    self.image = img if readonly or band_rows else img.astype(np.float32)
     # pointer yang digunakan untuk merujuk blok DCT mana pada gambar yang akan dibaca atau ditulis
     self.cur_x = 0
     self.cur_y = 0
@@ -42,8 +169,81 @@ class dct_steg():
     # Jumlah total blok dalam arah x dan y
     self.blocks_x = self.size_x // self.BLOCK_SIZE
     self.blocks_y = self.size_y // self.BLOCK_SIZE
-    # Indeks blok saat ini
+
+  # init_state mengisi status header, urutan langkah dan pembaca yang dipakai bersama oleh subclass (jpeg_steg)
+  # yang tidak menyimpan gambar piksel
+  def init_state(self, readonly):
+    self.readonly = readonly
+    # versi format payload yang terakhir dibaca oleh extract_bytes
+    self.version = None
+    # format lama memakai urutan blok pointer next(); format biner memakai seluruh blok gambar
+    self.legacy_walk = False
+    # nomor LAYOUTS yang dipakai embed_bits dan extract_bits
+    self.layout = 0
+    # permutasi langkah berkunci (None: langkah berurutan) yang berlaku mulai dari langkah permutation_start
+    self.permutation = None
+    self.permutation_start = 0
+    # koordinat blok yang ditulis oleh embed_bits sejak penyisipan terakhir dimulai (lihat touched_blocks)
+    self.touched = []
+    # Indeks blok (langkah) saat ini
     self.block_idx = 0
+    # pembaca baris bertahap dari open(); None jika seluruh gambar sudah ada di self.image
+    self.reader = None
+    self.loaded_rows = 0
+    self.closed = False
+
+  # open membuka gambar dari path atau bytes hanya untuk extract. Gambar PNG tidak didekode penuh: baris blok
+  # dibaca dari file hanya sampai baris terakhir yang memuat header dan payload, sehingga pesan pendek pada
+  # gambar besar tidak perlu mendekode seluruh gambar. Format lain didekode penuh dengan cv2.imdecode.
+  # File tetap terbuka sampai semua baris dibaca atau close() dipanggil; pakai sebagai context manager
+  # (with dct_steg.open(path) as obj) supaya file selalu ditutup
+  @classmethod
+  def open(cls, source, workers=1):
+    reader = png_rows(source)
+    if not reader.partial:
+      image = reader.read_all()
+      reader.close()
+      if image is None:
+        raise AppError("cannot decode image")
+      return cls(image, readonly=True, workers=workers)
+
+    # Baris yang belum dibaca tidak pernah disentuh, jadi np.empty tidak memakan memori untuk baris tersebut
+    obj = cls(np.empty(reader.shape, dtype=np.uint8), readonly=True, workers=workers)
+    obj.reader = reader
+    return obj
+
+  # pastikan baris blok 0..block_rows-1 sudah dibaca dari reader; ukuran yang dibaca naik paling sedikit dua kali
+  # lipat supaya pembacaan berulang (header lalu payload) tetap sebanding dengan baris yang dibutuhkan
+  def load_rows(self, block_rows):
+    if block_rows <= self.loaded_rows:
+      return
+    if self.reader is None:
+      # baris yang belum dibaca dari gambar yang sudah ditutup hanya berisi np.empty
+      if self.closed:
+        raise AppError("image is closed")
+      return
+    block_rows = min(max(block_rows, 2 * self.loaded_rows), -(-self.size_x // self.BLOCK_SIZE))
+    rows = self.reader.read(block_rows * self.BLOCK_SIZE)
+    if rows is None:
+      raise AppError("cannot decode image")
+    self.image[:len(rows)] = rows
+    self.loaded_rows = block_rows
+    if len(rows) == self.size_x:
+      self.reader.close()
+      self.reader = None
+
+  # tutup file pembaca baris dari open(); baris yang sudah dibaca tetap bisa dipakai
+  def close(self):
+    if self.reader is not None:
+      self.reader.close()
+      self.reader = None
+      self.closed = True
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
 
   # pindahkan penunjuk ke blok berikutnya
   def next(self):
@@ -65,33 +265,43 @@ class dct_steg():
     block = self.image[self.cur_x:self.cur_x+self.BLOCK_SIZE, 
                        self.cur_y:self.cur_y+self.BLOCK_SIZE, 
                        self.cur_channel]
-    return cv2.dct(block)
+    return cv2.dct(block.astype(np.float32))
+
+  # tolak penulisan pada gambar yang dibuka dengan readonly=True
+  def check_writable(self):
+    if self.readonly:
+      raise AppError("image is opened read-only")
 
   # Terapkan DCT terbalik dan perbarui blok gambar
   def update_block(self, dct_block):
+    self.check_writable()
     idct_block = cv2.idct(dct_block)
     self.image[self.cur_x:self.cur_x+self.BLOCK_SIZE, 
                self.cur_y:self.cur_y+self.BLOCK_SIZE, 
                self.cur_channel] = idct_block
 
-  # masukkan satu bit ke koefisien DCT
-  def put_bit(self, bit):
-    dct_block = self.get_dct_block()
-    
-    # Dapatkan koefisien frekuensi tengah (5,5)
-    coeff = dct_block[self.COEFF_INDEX, self.COEFF_INDEX]
+  # ubah koefisien tengah pada blok DCT menjadi genap atau ganjil berdasarkan bit
+  def set_coeff_bit(self, dct_block, bit, position=None):
+    # Dapatkan koefisien frekuensi tengah (5,5), atau koefisien pada position
+    position = position or (self.COEFF_INDEX, self.COEFF_INDEX)
+    coeff = dct_block[position]
     
     # Koefisien kuantisasi
     quant_coeff = round(coeff / self.QUANT_FACTOR)
     
     # Ubah koefisien menjadi genap atau ganjil berdasarkan bit
-    if bit == '0' and quant_coeff % 2 == 1:
+    if int(bit) == 0 and quant_coeff % 2 == 1:
       quant_coeff -= 1
-    elif bit == '1' and quant_coeff % 2 == 0:
+    elif int(bit) == 1 and quant_coeff % 2 == 0:
       quant_coeff += 1
     
     # Perbarui koefisien
-    dct_block[self.COEFF_INDEX, self.COEFF_INDEX] = quant_coeff * self.QUANT_FACTOR
+    dct_block[position] = quant_coeff * self.QUANT_FACTOR
+    return dct_block
+
+  # masukkan satu bit ke koefisien DCT
+  def put_bit(self, bit):
+    dct_block = self.set_coeff_bit(self.get_dct_block(), bit)
     
     # Perbarui blok pada gambar
     self.update_block(dct_block)
@@ -130,36 +340,325 @@ class dct_steg():
 
     return bits
 
-  # menyematkan teks ke gambar menggunakan DCT
-  def embed(self, text):
-    # Hitung panjang teks dan ubah ke biner dengan panjang 16 bit
-    text_length = i2bin(len(text), self.MAX_BIT_LENGTH)
-    
-    # Berikan panjang pada 16 blok pertama
-    self.put_bits(text_length)
-
-    # Letakkan setiap karakter pada teks ke gambar
-    for c in text:
-      # Konversi karakter menjadi biner dengan panjang 8
-      bits = char2bin(c)
-      # Taruh setiap bit ke dalam blok masing-masing
-      self.put_bits(bits)
-    
-    # Konversi kembali ke uint8 untuk penyimpanan yang tepat
-    self.image = np.clip(self.image, 0, 255).astype(np.uint8)
+  # jumlah bit header format yang ditulis embed_bytes
+  @classmethod
+  def header_bits(cls):
+    return 8 * (struct.calcsize(cls.CHECKED_HEADER) + struct.calcsize(cls.HEADER_CHECK))
+
+  # kapasitas payload embed_bytes (dalam byte) untuk gambar berukuran shape dengan layout tersebut
+  @classmethod
+  def capacity(cls, shape, layout=0):
+    total = block_grid(tuple(shape), False, cls.BLOCK_SIZE)[3]
+    return max(0, min((total - cls.header_bits()) * len(cls.LAYOUTS[layout]) // 8, (1 << 32) - 1))
+
+  # jumlah langkah (blok) untuk count bit dengan layout tersebut
+  @classmethod
+  def layout_steps(cls, count, layout):
+    return -(-count // len(cls.LAYOUTS[layout]))
+
+  # jumlah langkah yang tersedia pada urutan langkah saat ini
+  def total_steps(self):
+    return block_grid(tuple(self.image.shape), self.legacy_walk, self.BLOCK_SIZE)[3]
+
+  # set_key mengacak urutan langkah mulai dari langkah start dengan permutasi yang ditentukan oleh key (str atau
+  # bytes), sehingga bit payload tersebar ke seluruh gambar dan bukan hanya di baris blok teratas
+  def set_key(self, key, start):
+    if isinstance(key, str):
+      key = key.encode('utf-8')
+    self.permutation = step_permutation(hashlib.sha256(key).digest(), max(0, self.total_steps() - start))
+    self.permutation_start = start
+
+  # nomor langkah (setelah permutasi) untuk langkah block_idx sampai end - 1
+  def permuted_steps(self, end):
+    start = self.permutation_start
+    return self.permutation[self.block_idx - start:end - start].astype(np.int64) + start
+
+  # koordinat (baris blok, kolom blok, channel) untuk count langkah berikutnya, diambil dari block_index;
+  # block_idx menunjuk langkah berikutnya yang akan dipakai
+  def walk_index(self, count):
+    shape = tuple(self.image.shape)
+    end = self.block_idx + count
+    if end > self.total_steps():
+      raise AppError("need larger image")
+
+    if self.permutation is not None:
+      # Satu gather dari permutasi yang sudah di-cache, koordinatnya dihitung langsung dari nomor langkah
+      rows, cols, channel = grid_steps(shape, self.permuted_steps(end), self.legacy_walk, self.BLOCK_SIZE)
+    elif count <= self.DIRECT_INDEX_STEPS:
+      rows, cols, channel = grid_steps(shape, np.arange(self.block_idx, end), self.legacy_walk, self.BLOCK_SIZE)
+    else:
+      index = block_index(shape, self.legacy_walk, self.BLOCK_SIZE)
+      rows, cols, channel = (a[self.block_idx:end] for a in index)
+    self.block_idx = end
+    return rows, cols, channel
+
+  # bagi count langkah menjadi potongan berurutan (slice) untuk dikerjakan paralel
+  def split_steps(self, count):
+    parts = max(1, min(self.workers, count // self.PARALLEL_MIN_BLOCKS))
+    bounds = np.linspace(0, count, parts + 1).astype(int)
+    return [slice(start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+
+  # jalankan fn untuk setiap item; lebih dari satu item dikerjakan di thread pool berisi workers thread
+  def run_parallel(self, fn, items):
+    if self.workers <= 1 or len(items) <= 1:
+      return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=self.workers) as pool:
+      return list(pool.map(fn, items))
+
+  # sisipkan bit (N, k) ke tumpukan blok float32 (N, 8, 8) pada k koefisien layout dengan satu DCT maju dan satu
+  # DCT terbalik
+  def embed_blocks(self, blocks, bits, layout):
+    u, v = np.array(layout).T
+    coeffs = block_dct(blocks.astype(np.float64))
+    ratio = coeffs[:, u, v] / self.QUANT_FACTOR
+    quant = np.rint(ratio)
+    quant += (quant % 2 != bits) * np.where(bits == 1, 1, -1)
+    coeffs[:, u, v] = quant * self.QUANT_FACTOR
+    result = block_idct(coeffs)
+
+    # blok yang koefisiennya hampir tepat di .5 atau pikselnya hampir tepat bilangan bulat bisa dibulatkan berbeda
+    # oleh cv2 (float32), jadi blok tersebut dihitung ulang dengan cv2 agar hasil akhirnya identik dengan put_bit
+    frac = result - np.floor(result)
+    inexact = (np.abs(ratio - np.floor(ratio) - 0.5) < self.EXACT_TOLERANCE).any(axis=1)
+    inexact |= ((frac < self.EXACT_TOLERANCE) | (frac > 1 - self.EXACT_TOLERANCE)).any(axis=(1, 2))
+    result = result.astype(np.float32)
+    for i in np.flatnonzero(inexact):
+      dct_block = cv2.dct(blocks[i])
+      for position, bit in zip(layout, bits[i]):
+        dct_block = self.set_coeff_bit(dct_block, bit, position)
+      result[i] = cv2.idct(dct_block)
+    return result
+
+  # embed_region menyisipkan bit (N, k) ke blok (rows, cols, channel) pada image float32
+  # sparse=True tidak melakukan DCT penuh: koefisien dibaca dengan layout_basis dan perubahan koefisien
+  # diterapkan sebagai pola basis yang diskalakan langsung di domain piksel, hanya pada blok yang paritasnya
+  # belum sesuai (hasilnya tidak identik bit dengan put_bit karena blok lain tidak disentuh sama sekali).
+  # Di blok yang diubah, semua k koefisien layout dipindah ke tengah bin kuantisasinya seperti jalur penuh, supaya
+  # koefisien yang paritasnya sudah benar tetapi dekat batas .5 tidak bergeser melewatinya saat dibulatkan ke uint8
+  def embed_region(self, image, rows, cols, channel, bits, sparse):
+    blocks = block_view(image)
+    layout = self.LAYOUTS[self.layout]
+    if not sparse:
+      blocks[rows, cols, channel] = self.embed_blocks(blocks[rows, cols, channel], bits, layout)
+      return
+
+    basis = layout_basis(layout)
+    coeffs = blocks[rows, cols, channel].reshape(-1, self.BLOCK_SIZE * self.BLOCK_SIZE) @ basis
+    quant = np.rint(coeffs / self.QUANT_FACTOR)
+    wrong = quant % 2 != bits
+    change = np.flatnonzero(wrong.any(axis=1))
+    target = (quant[change] + wrong[change] * np.where(bits[change] == 1, 1, -1)) * self.QUANT_FACTOR
+    delta = (target - coeffs[change]) @ basis.T
+    blocks[rows[change], cols[change], channel[change]] += delta.reshape(-1, self.BLOCK_SIZE, self.BLOCK_SIZE)
+
+  # embed_bits menyisipkan array bit (0/1) ke blok-blok berikutnya sekaligus, k bit per blok sesuai layout
+  # (sparse: lihat embed_region)
+  def embed_bits(self, bits, sparse=False):
+    self.check_writable()
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1, len(self.LAYOUTS[self.layout]))
+    rows, cols, channel = self.walk_index(len(bits))
+    self.touched.append((rows, cols, channel))
+    if self.band_rows is None:
+      # Setiap potongan berisi blok yang berbeda, jadi thread bisa menulis ke gambar yang sama tanpa kunci
+      self.run_parallel(lambda s: self.embed_region(self.image, rows[s], cols[s], channel[s], bits[s], sparse),
+                        self.split_steps(len(bits)))
+      return
+
+    # Mode pita: setiap pita band_rows baris blok yang berisi payload dikonversi ke float32 sendiri-sendiri,
+    # lalu langsung ditulis kembali ke gambar uint8 sehingga memori puncak hanya sebesar satu pita per thread
+    band = rows // self.band_rows
+    order = np.argsort(band, kind='stable')
+    bands, starts = np.unique(band[order], return_index=True)
+    height = self.band_rows * self.BLOCK_SIZE
+
+    def embed_band(item):
+      b, sel = item
+      b = int(b)
+      region = self.image[b*height:(b+1)*height].astype(np.float32)
+      self.embed_region(region, rows[sel] - b*self.band_rows, cols[sel], channel[sel], bits[sel], sparse)
+      self.image[b*height:(b+1)*height] = np.clip(region, 0, 255).astype(np.uint8)
+
+    self.run_parallel(embed_band, list(zip(bands, np.split(order, starts[1:]))))
+    if isinstance(self.image, np.memmap):
+      self.image.flush()
+
+  # extract_bits membaca count bit berikutnya sekaligus sebagai array uint8; hanya blok yang dibutuhkan yang diambil
+  # dari view bertingkat gambar, dan k koefisien layout dihitung dengan satu perkalian terhadap layout_basis
+  def extract_bits(self, count):
+    basis = layout_basis(self.LAYOUTS[self.layout])
+    rows, cols, channel = self.walk_index(self.layout_steps(count, self.layout))
+    # Urutan langkah berjalan per baris blok, jadi baris blok terakhir yang dibutuhkan ada di langkah terakhir
+    # (kecuali langkahnya diacak)
+    if count:
+      self.load_rows(int(rows[-1] if self.permutation is None else rows.max()) + 1)
+    view = block_view(self.image)
+
+    def read_coeffs(s):
+      blocks = view[rows[s], cols[s], channel[s]]
+      return blocks.reshape(-1, self.BLOCK_SIZE * self.BLOCK_SIZE) @ basis
+
+    coeffs = np.concatenate(self.run_parallel(read_coeffs, self.split_steps(len(rows))))
+    quant = np.rint(coeffs / self.QUANT_FACTOR)
+    return (quant % 2).astype(np.uint8).ravel()[:count]
+
+  # menyisipkan header dengan layout 0 lalu payload (array uint8) dengan layout tersebut; dengan key, langkah
+  # payload diacak (header tetap berurutan supaya bisa dibaca tanpa kunci)
+  def embed_payload(self, header, payload, sparse, layout=0, key=None):
+    self.touched = []
+    self.layout = 0
+    self.permutation = None
+    self.embed_bits(np.unpackbits(np.frombuffer(header, dtype=np.uint8)), sparse)
+    self.layout = layout
+    if key is not None:
+      self.set_key(key, self.block_idx)
+    self.embed_bits(np.unpackbits(payload), sparse)
+    self.store()
+
+  # touched_blocks mengembalikan (baris blok, kolom blok, channel) dari semua blok yang ditulis oleh penyisipan
+  # terakhir. Piksel di luar blok ini (termasuk akibat clipping) tidak berubah, jadi MSE/PSNR cukup dihitung dari
+  # blok ini saja (lihat psnr.calculate_block_psnr)
+  def touched_blocks(self):
+    if not self.touched:
+      return tuple(np.empty(0, dtype=np.intp) for _ in range(3))
+    return tuple(np.concatenate(a) for a in zip(*self.touched))
+
+  # simpan hasil penyisipan ke self.image
+  def store(self):
+    # Konversi kembali ke uint8 untuk penyimpanan yang tepat (mode pita sudah menulis uint8 langsung)
+    if self.band_rows is None:
+      self.image = np.clip(self.image, 0, 255).astype(np.uint8)
+
+  # membaca count byte berikutnya
+  def read_bytes(self, count):
+    return np.packbits(self.extract_bits(8 * count)).tobytes()
+
+  # menyematkan data biner ke gambar dalam FORMAT_CHECKED, setiap byte sebagai 8 bit
+  # data boleh berupa bytes, bytearray atau memoryview; dibaca langsung lewat np.frombuffer tanpa salinan
+  # layout memilih LAYOUTS untuk payload: lebih banyak koefisien per blok berarti lebih sedikit blok (dan DCT)
+  # per byte serta kapasitas lebih besar, dengan perubahan piksel per blok yang lebih besar
+  # key (opsional) menyebar payload ke seluruh gambar dengan permutasi berkunci; extract_bytes membutuhkan key
+  # yang sama
+  def embed_bytes(self, data, sparse=False, layout=0, key=None):
+    payload = np.frombuffer(data, dtype=np.uint8)
+    if not 0 <= layout < len(self.LAYOUTS):
+      raise AppError("unsupported coefficient layout")
+    # Gagal lebih awal sebelum ada piksel yang diubah
+    if not self.fits(self.header_bits() + self.layout_steps(8 * len(payload), layout)):
+      raise AppError("need larger image")
+
+    self.legacy_walk = False
+    flags = layout | (self.FLAG_PERMUTED if key is not None else 0)
+    fields = struct.pack(self.CHECKED_HEADER, self.FORMAT_MARKER, self.FORMAT_CHECKED, flags, len(payload),
+                         zlib.crc32(payload))
+    header = fields + struct.pack(self.HEADER_CHECK, zlib.crc32(fields) & 0xFFFF)
+    self.embed_payload(header, payload, sparse, layout, key)
+
+  # apakah masih ada count langkah (blok) format biner mulai dari block_idx
+  def fits(self, count):
+    return self.block_idx + count <= block_grid(tuple(self.image.shape), False, self.BLOCK_SIZE)[3]
+
+  # read_header membaca header format baru mulai dari block_idx dan mengembalikan dict berisi version, flags,
+  # layout, permuted, length dan crc (None untuk FORMAT_BINARY); None jika penanda tidak ada (kemungkinan format
+  # lama). Header yang rusak langsung ditolak dengan AppError sebelum payload dibaca. Setelahnya self.layout berisi
+  # layout payload
+  def read_header(self):
+    self.legacy_walk = False
+    self.layout = 0
+    self.permutation = None
+    marker, = struct.unpack('>H', self.read_bytes(2))
+    if marker != self.FORMAT_MARKER:
+      return None
+
+    version, = struct.unpack('>B', self.read_bytes(1))
+    if version == self.FORMAT_BINARY:
+      length, = struct.unpack('>H', self.read_bytes(2))
+      header = {'version': version, 'flags': 0, 'length': length, 'crc': None}
+    elif version == self.FORMAT_CHECKED:
+      rest = self.read_bytes(struct.calcsize(self.CHECKED_HEADER) - 3)
+      fields = struct.pack('>HB', marker, version) + rest
+      check, = struct.unpack(self.HEADER_CHECK, self.read_bytes(struct.calcsize(self.HEADER_CHECK)))
+      if check != zlib.crc32(fields) & 0xFFFF:
+        raise AppError("header checksum mismatch")
+      _, _, flags, length, crc = struct.unpack(self.CHECKED_HEADER, fields)
+      header = {'version': version, 'flags': flags, 'length': length, 'crc': crc}
+    else:
+      raise AppError("unsupported payload version")
+
+    if header['flags'] & ~(self.LAYOUT_MASK | self.FLAG_PERMUTED):
+      raise AppError("unsupported payload flags")
+    header['layout'] = header['flags'] & self.LAYOUT_MASK
+    header['permuted'] = bool(header['flags'] & self.FLAG_PERMUTED)
+    if header['layout'] >= len(self.LAYOUTS):
+      raise AppError("unsupported coefficient layout")
+    if not self.fits(self.layout_steps(8 * header['length'], header['layout'])):
+      raise AppError("payload length exceeds image capacity")
+    self.layout = header['layout']
+    return header
+
+  # probe hanya membaca blok header untuk memeriksa apakah gambar membawa payload; mengembalikan dict dari
+  # read_header, atau None jika tidak ada payload yang valid. Format lama tidak punya penanda, jadi juga None
+  def probe(self):
+    start, layout, permutation = self.block_idx, self.layout, self.permutation
+    try:
+      header = self.read_header()
+    except AppError:
+      header = None
+    self.block_idx, self.layout, self.permutation = start, layout, permutation
+    return header
+
+  # mengekstrak data biner; gambar format lama (teks dari embed) juga bisa dibaca, versinya disimpan di self.version
+  # key hanya dipakai jika payload disisipkan dengan key
+  def extract_bytes(self, key=None):
+    # Baca header: penanda format baru, atau panjang teks format lama
+    start = self.block_idx
+    header = self.read_header()
+    if header is None:
+      return self.extract_legacy(start)
+
+    if header['permuted']:
+      if key is None:
+        raise AppError("payload is keyed, key required")
+      self.set_key(key, self.block_idx)
+
+    # Baca setiap 8 bit sebagai satu byte
+    self.version = header['version']
+    data = self.read_bytes(header['length'])
+    if header['crc'] is not None and zlib.crc32(data) != header['crc']:
+      raise AppError("payload checksum mismatch")
+    return data
+
+  # membaca payload format lama (panjang 16 bit lalu teks) mulai dari langkah start
+  def extract_legacy(self, start):
+    # Format lama memakai urutan blok yang berbeda, jadi panjangnya dibaca ulang dari awal
+    self.version = self.FORMAT_LEGACY
+    self.legacy_walk = True
+    self.layout = 0
+    self.permutation = None
+    self.block_idx = start
+    length, = struct.unpack('>H', self.read_bytes(2))
+    return self.read_bytes(length)
+
+  # menyematkan teks ke gambar menggunakan DCT (sparse: lihat embed_bits)
+  def embed(self, text, sparse=False):
+    # Setiap karakter disimpan sebagai satu byte, jadi hanya karakter dengan kode di bawah 256 yang didukung
+    try:
+      payload = np.frombuffer(text.encode('latin-1'), dtype=np.uint8)
+    except UnicodeEncodeError:
+      raise AppError("bit size is larger than expected.")
+
+    # Panjang teks disimpan dalam 16 bit; nilai FORMAT_MARKER dicadangkan untuk format biner
+    if len(payload) >= self.FORMAT_MARKER:
+      raise AppError("bit size is larger than expected.")
+
+    # Gagal lebih awal sebelum ada piksel yang diubah (mode pita menulis langsung ke gambar pemanggil)
+    self.legacy_walk = True
+    if self.block_idx + self.MAX_BIT_LENGTH + 8 * len(payload) > self.total_steps():
+      raise AppError("need larger image")
+    self.embed_payload(struct.pack('>H', len(payload)), payload, sparse)
 
   # mengekstrak teks dari gambar menggunakan DCT
   def extract(self):
-    # Baca 16 blok pertama sepanjang teks yang terdapat pada gambar
-    length = int(self.read_bits(self.MAX_BIT_LENGTH), 2)
-    text = ""
-    for _ in range(0, length):
-      # Baca setiap 8 bit sebagai karakter
-      c = int(self.read_bits(8), 2)
-      # Konversi biner menjadi karakter
-      text += chr(c)
-
-    return text
+    return self.extract_bytes().decode('latin-1')
 
   # simpan gambar ke dstPath
   def save(self, dstPath):
@@ -172,6 +671,6 @@ if __name__ == "__main__":
     # obj.embed("ku yakin pasti suatu saat semua mungkin terjadi, kau kan mencintaiku dan tak akan pernah melepasku aku mau mendampingi dirimu, aku mau mencintai kekuranganmu, s'lalu bersedia bahagiakanmu apapun yang terjadi, kujanjikan aku ada...") 
     # obj.simpan('dst.png')
 
-  obj = dct_steg(cv2.imread('dst.png'))
+  obj = dct_steg.open('dst.png')
   text = obj.extract()
   print(text)
\ No newline at end of file
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import cv2
+import numpy as np
+from dct import DCT_MATRIX, block_view, layout_basis, dct_steg
+
+# Tabel kuantisasi standar JPEG (ITU-T T.81 Annex K) untuk kualitas 50, urutan baris-kolom
+LUMA_TABLE = np.array([
+    [16, 11, 10, 16, 24, 40, 51, 61],
+    [12, 12, 14, 19, 26, 58, 60, 55],
+    [14, 13, 16, 24, 40, 57, 69, 56],
+    [14, 17, 22, 29, 51, 87, 80, 62],
+    [18, 22, 37, 56, 68, 109, 103, 77],
+    [24, 35, 55, 64, 81, 104, 113, 92],
+    [49, 64, 78, 87, 103, 121, 120, 101],
+    [72, 92, 95, 98, 112, 100, 103, 99],
+], dtype=np.int32)
+CHROMA_TABLE = np.full((8, 8), 99, dtype=np.int32)
+CHROMA_TABLE[:4, :4] = [
+    [17, 18, 24, 47],
+    [18, 21, 26, 66],
+    [24, 26, 56, 99],
+    [47, 66, 99, 99],
+]
+
+# Konversi warna JFIF (BGR -> YCbCr dan kebalikannya), baris: Y, Cb, Cr
+BGR_TO_YCC = np.array([
+    [0.114, 0.587, 0.299],
+    [0.5, -0.331264, -0.168736],
+    [-0.081312, -0.418688, 0.5],
+], dtype=np.float32)
+YCC_TO_BGR = np.array([
+    [1.0, 1.772, 0.0],
+    [1.0, -0.344136, -0.714136],
+    [1.0, 0.0, 1.402],
+], dtype=np.float32)
+
+def scaled_tables(qualities):
+    """
+    Skala tabel kuantisasi untuk setiap kualitas seperti libjpeg (jpeg_quality_scaling, baseline)
+
+    Argumen:
+    qualities (list): Nilai kualitas JPEG (1-100).
+
+    Pengembalian:
+    tuple: (tabel luma, tabel chroma), masing-masing array float32 (Q, 8, 8).
+    """
+    qualities = np.clip(np.asarray(qualities, dtype=np.int32), 1, 100)
+    scale = np.where(qualities < 50, 5000 // qualities, 200 - 2 * qualities)[:, None, None]
+    luma = np.clip((LUMA_TABLE * scale + 50) // 100, 1, 255)
+    chroma = np.clip((CHROMA_TABLE * scale + 50) // 100, 1, 255)
+    return luma.astype(np.float32), chroma.astype(np.float32)
+
+def fancy_upsample(plane, axis):
+    """
+    Perbesar 2x pada satu sumbu dengan filter segitiga seperti upsampling "fancy" libjpeg: setiap sampel
+    keluaran = 3/4 sampel terdekat + 1/4 tetangganya. Di tepi MCU tetangganya adalah sampel tepi itu sendiri,
+    karena chroma MCU di sebelahnya tidak ikut disimulasikan.
+    """
+    n = plane.shape[axis]
+    previous = np.take(plane, np.maximum(np.arange(n) - 1, 0), axis=axis)
+    following = np.take(plane, np.minimum(np.arange(n) + 1, n - 1), axis=axis)
+    result = np.stack([0.75 * plane + 0.25 * previous, 0.75 * plane + 0.25 * following], axis=axis + 1)
+    return result.reshape(plane.shape[:axis] + (2 * n,) + plane.shape[axis + 1:])
+
+def read_block_bits(image, rows, cols, channel, layout):
+    """
+    Membaca bit yang dibawa blok (rows, cols, channel) dengan layout koefisien dct_steg.
+
+    Argumen:
+    image (numpy.ndarray): Gambar (H, W, 3), atau tumpukan gambar (..., H, W, 3) yang dibaca sekaligus.
+    rows, cols, channel (numpy.ndarray): Koordinat blok, misalnya dari dct_steg.walk_index.
+    layout (int): Nomor layout di dct_steg.LAYOUTS.
+
+    Pengembalian:
+    numpy.ndarray: Bit uint8 (..., N, k), k jumlah koefisien layout.
+    """
+    blocks = block_view(image)[..., rows, cols, channel, :, :]
+    coeffs = blocks.reshape(blocks.shape[:-2] + (64,)) @ layout_basis(dct_steg.LAYOUTS[layout])
+    return (np.rint(coeffs / dct_steg.QUANT_FACTOR) % 2).astype(np.uint8)
+
+def simulate_bits(image, rows, cols, channel, layout, qualities, subsample=True, max_bytes=64 << 20):
+    """
+    Memperkirakan bit yang terbaca setelah kompresi JPEG pada setiap kualitas, tanpa codec.
+
+    Hanya MCU (16x16 piksel, atau 8x8 tanpa subsampling) yang berisi blok yang diminta yang diproses:
+    piksel diubah ke YCbCr, chroma diperkecil 2x2 (4:2:0, bawaan cv2.imwrite), di-DCT, dikuantisasi dengan
+    tabel setiap kualitas sekaligus (sumbu kualitas di depan), lalu dikembalikan ke piksel BGR dan bitnya
+    dibaca seperti dct_steg.extract_bits. Perbedaan dengan libjpeg (DCT integer, pembulatan antara dan
+    upsampling chroma di tepi MCU) membuat hasilnya perkiraan; bandingkan dengan verify_bits untuk memastikan.
+
+    Argumen:
+    image (numpy.ndarray): Gambar stego uint8 (H, W, 3) BGR.
+    rows, cols, channel (numpy.ndarray): Koordinat blok dct_steg.
+    layout (int): Nomor layout di dct_steg.LAYOUTS.
+    qualities (list): Nilai kualitas JPEG.
+    subsample (bool): Chroma 4:2:0 (True) atau 4:4:4 (False).
+    max_bytes (int): Batas perkiraan memori kerja; kualitas diproses per potongan agar tidak melebihinya.
+
+    Pengembalian:
+    numpy.ndarray: Bit uint8 (Q, N, k).
+    """
+    height, width = image.shape[:2]
+    mcu = 16 if subsample else 8
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    channel = np.asarray(channel, dtype=np.int64)
+    blocks_per_mcu = mcu // 8
+
+    # MCU unik yang berisi blok yang diminta; piksel di luar gambar diisi piksel tepi seperti encoder JPEG
+    mcu_cols = -(-width // mcu)
+    ids, inverse = np.unique((rows // blocks_per_mcu) * mcu_cols + cols // blocks_per_mcu, return_inverse=True)
+    y = np.minimum((ids // mcu_cols)[:, None] * mcu + np.arange(mcu), height - 1)
+    x = np.minimum((ids % mcu_cols)[:, None] * mcu + np.arange(mcu), width - 1)
+    pixels = image[y[:, :, None], x[:, None, :]].astype(np.float32)
+
+    # YCbCr dibulatkan ke sampel 8 bit, lalu geser ke -128..127
+    ycc = np.rint(pixels @ BGR_TO_YCC.T)
+    ycc[..., 1:] += 128
+    ycc = np.clip(ycc, 0, 255) - 128
+    count = len(ids)
+
+    def to_blocks(plane):
+        # (M, n*8, n*8) -> (M, n*n, 8, 8)
+        n = plane.shape[1] // 8
+        return plane.reshape(count, n, 8, n, 8).transpose(0, 1, 3, 2, 4).reshape(count, n * n, 8, 8)
+
+    def from_blocks(blocks):
+        n = int(round(np.sqrt(blocks.shape[-3])))
+        lead = blocks.shape[:-3]
+        return blocks.reshape(lead + (n, n, 8, 8)).swapaxes(-3, -2).reshape(lead + (n * 8, n * 8))
+
+    chroma = ycc[..., 1:]
+    if subsample:
+        chroma = np.rint(chroma.reshape(count, 8, 2, 8, 2, 2).mean(axis=(2, 4)))
+    dct = DCT_MATRIX.astype(np.float32)
+    luma_coeffs = dct @ to_blocks(ycc[..., 0]) @ dct.T
+    chroma_coeffs = np.stack([dct @ to_blocks(chroma[..., c]) @ dct.T for c in range(2)], axis=1)
+
+    luma_tables, chroma_tables = scaled_tables(qualities)
+    basis = layout_basis(dct_steg.LAYOUTS[layout]).astype(np.float32)
+    row_in, col_in = rows % blocks_per_mcu, cols % blocks_per_mcu
+
+    # Hanya blok luma yang diminta yang direkonstruksi; chroma direkonstruksi per MCU lalu diambil kuadrannya
+    luma_coeffs = luma_coeffs[inverse, row_in * blocks_per_mcu + col_in]
+    # Baris YCC_TO_BGR untuk channel setiap blok: piksel = Y + a * Cb + b * Cr
+    weights = YCC_TO_BGR[channel][:, None, 1:, None, None]
+
+    # Perkiraan byte kerja per kualitas: beberapa salinan float32 blok yang direkonstruksi
+    chunk = max(1, int(max_bytes // max(1, 16 * 64 * 4 * (len(rows) + 4 * count))))
+    results = []
+    for start in range(0, len(luma_tables), chunk):
+        luma_q = luma_tables[None, start:start + chunk]
+        chroma_q = chroma_tables[start:start + chunk, None, None, None]
+
+        # Kuantisasi dan dekuantisasi untuk semua kualitas potongan ini sekaligus; luma (N, Q, 8, 8)
+        luma = dct.T @ (np.rint(luma_coeffs[:, None] / luma_q) * luma_q) @ dct
+        chroma = from_blocks(dct.T @ (np.rint(chroma_coeffs / chroma_q) * chroma_q) @ dct)
+        if subsample:
+            chroma = fancy_upsample(fancy_upsample(chroma, chroma.ndim - 2), chroma.ndim - 1)
+
+        # Kuadran chroma setiap blok (N, Q, 2, 8, 8), lalu langsung ke channel BGR blok tersebut
+        chroma = chroma.reshape(chroma.shape[:3] + (blocks_per_mcu, 8, blocks_per_mcu, 8))
+        chroma = chroma[:, inverse, :, row_in, :, col_in]
+        pixels = np.clip(np.rint(luma + 128 + (weights * chroma).sum(axis=2)), 0, 255)
+
+        coeffs = pixels.reshape(pixels.shape[:2] + (-1,)) @ basis
+        results.append((np.rint(coeffs / dct_steg.QUANT_FACTOR) % 2).astype(np.uint8).swapaxes(0, 1))
+    return np.concatenate(results)
+
+def verify_bits(image, rows, cols, channel, layout, qualities):
+    """
+    Bit yang terbaca setelah kompresi JPEG sungguhan (cv2.imencode/imdecode) pada setiap kualitas,
+    sebagai pembanding simulate_bits.
+
+    Pengembalian:
+    numpy.ndarray: Bit uint8 (Q, N, k).
+    """
+    results = []
+    for quality in qualities:
+        ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        results.append(read_block_bits(cv2.imdecode(encoded, cv2.IMREAD_COLOR), rows, cols, channel, layout))
+    return np.stack(results)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+import re
+import struct
+import sys
+import numpy as np
+from dct import AppError, dct_steg
+
+# marker JPEG yang tidak diikuti panjang segmen
+STANDALONE_MARKERS = {0x01, 0xD8, 0xD9} | set(range(0xD0, 0xD8))
+# SOF0 (baseline) dan SOF1 (sequential diperluas) sama-sama memakai Huffman berurutan yang didukung di sini
+SEQUENTIAL_FRAMES = {0xC0, 0xC1}
+UNSUPPORTED_FRAMES = {0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# akhir data entropi: 0xFF yang bukan byte stuffing (FF 00) dan bukan marker restart (FF D0-D7)
+SCAN_END = re.compile(rb'\xff[^\x00\xd0-\xd7]')
+RESTART_MARKER = re.compile(rb'(\xff[\xd0-\xd7])')
+
+# tabel pencarian 16 bit untuk satu tabel Huffman: entri = panjang kode * 256 + simbol, 0 jika kode tidak valid
+def huffman_lookup(counts, symbols):
+  lookup = [0] * (1 << 16)
+  code = 0
+  k = 0
+  for length in range(1, 17):
+    for _ in range(counts[length - 1]):
+      shift = 16 - length
+      lookup[code << shift:(code + 1) << shift] = [length * 256 + symbols[k]] * (1 << shift)
+      code += 1
+      k += 1
+    code <<= 1
+  return lookup
+
+# jpeg_steg menyisipkan payload langsung pada koefisien DCT terkuantisasi JPEG baseline, tanpa decode ke piksel.
+# Pembawa bit adalah setiap koefisien AC dengan |nilai| >= 2 sesuai urutan scan; bitnya adalah paritas |nilai|.
+# Mengubah paritas cukup dengan membalik bit terakhir dari bit tambahan (magnitude) koefisien tersebut, sehingga
+# |nilai| berubah satu tetapi kategori ukurannya tetap: simbol Huffman, tabel Huffman, tabel kuantisasi dan
+# panjang aliran bit tidak berubah. Hanya data entropi sampai payload terakhir yang perlu dibaca, dan file ditulis
+# kembali dengan byte stuffing ulang saja.
+# Header, probe(), embed_bytes() dan extract_bytes() sama dengan dct_steg (FORMAT_CHECKED)
+class jpeg_steg(dct_steg):
+
+  # setiap pembawa JPEG hanya menyimpan satu bit, jadi hanya layout 0 yang tersedia
+  LAYOUTS = dct_steg.LAYOUTS[:1]
+
+  def __init__(self, data, readonly=False):
+    self.init_state(readonly)
+    self.data = bytes(data)
+    self.parse()
+
+    # posisi bit (dalam aliran tanpa stuffing) dari bit terakhir magnitude setiap pembawa, dan 1 jika nilainya negatif
+    self.positions = []
+    self.negative = []
+    self.carriers = self.decode_carriers()
+
+  # parse membaca segmen sebelum scan: frame, tabel Huffman, interval restart dan header SOS
+  def parse(self):
+    data = self.data
+    if data[:2] != b'\xff\xd8':
+      raise AppError("not a JPEG file")
+
+    self.restart_interval = 0
+    self.frame = None
+    tables = {}
+    pos = 2
+    while True:
+      while pos < len(data) and data[pos] == 0xFF:
+        pos += 1
+      if pos >= len(data):
+        raise AppError("JPEG has no scan")
+      marker = data[pos]
+      pos += 1
+      if marker in STANDALONE_MARKERS:
+        continue
+
+      length, = struct.unpack('>H', data[pos:pos+2])
+      segment = data[pos+2:pos+length]
+      if marker in UNSUPPORTED_FRAMES:
+        raise AppError("only baseline JPEG is supported")
+      if marker in SEQUENTIAL_FRAMES:
+        self.parse_frame(segment)
+      elif marker == 0xC4:
+        self.parse_huffman(segment, tables)
+      elif marker == 0xDD:
+        self.restart_interval, = struct.unpack('>H', segment[:2])
+      elif marker == 0xDA:
+        self.parse_scan(segment, tables)
+        self.scan_start = pos + length
+        break
+      pos += length
+
+    end = SCAN_END.search(data, self.scan_start)
+    self.scan_end = end.start() if end else len(data)
+
+    # data entropi dipecah pada marker restart; setiap bagian disimpan tanpa byte stuffing dalam satu bytearray
+    parts = RESTART_MARKER.split(data[self.scan_start:self.scan_end])
+    self.restart_markers = parts[1::2]
+    segments = [part.replace(b'\xff\x00', b'\xff') for part in parts[0::2]]
+    self.segment_starts = np.cumsum([0] + [len(segment) for segment in segments])
+    self.stream = bytearray(b''.join(segments))
+
+  def parse_frame(self, segment):
+    precision, height, width, count = struct.unpack('>BHHB', segment[:6])
+    if precision != 8:
+      raise AppError("only 8-bit JPEG is supported")
+    components = {}
+    for i in range(count):
+      cid, sampling, _ = struct.unpack('>BBB', segment[6+3*i:9+3*i])
+      components[cid] = (sampling >> 4, sampling & 15)
+    self.frame = (height, width, components)
+
+  def parse_huffman(self, segment, tables):
+    pos = 0
+    while pos < len(segment):
+      table_class, table_id = segment[pos] >> 4, segment[pos] & 15
+      counts = segment[pos+1:pos+17]
+      symbols = segment[pos+17:pos+17+sum(counts)]
+      tables[table_class, table_id] = huffman_lookup(counts, symbols)
+      pos += 17 + sum(counts)
+
+  def parse_scan(self, segment, tables):
+    if self.frame is None:
+      raise AppError("JPEG scan before frame header")
+    height, width, components = self.frame
+    count = segment[0]
+    if count != len(components):
+      raise AppError("multi-scan JPEG is not supported")
+
+    hmax = max(h for h, _ in components.values())
+    vmax = max(v for _, v in components.values())
+    # (tabel DC, tabel AC, blok per MCU) untuk setiap komponen dalam urutan scan
+    self.scan = []
+    for i in range(count):
+      cid, selector = segment[1+2*i], segment[2+2*i]
+      h, v = components[cid]
+      if count == 1:
+        h = v = 1
+      self.scan.append((tables[0, selector >> 4], tables[1, selector & 15], h * v))
+
+    if count == 1:
+      # scan satu komponen tidak diselang-seling: satu MCU adalah satu blok
+      self.mcu_count = -(-width // 8) * -(-height // 8)
+    else:
+      self.mcu_count = -(-width // (8 * hmax)) * -(-height // (8 * vmax))
+
+  # decode_carriers adalah generator yang mendekode data entropi secara bertahap dan mencatat pembawa bit ke
+  # self.positions/self.negative; generator ini hanya dijalankan sejauh jumlah pembawa yang dibutuhkan
+  def decode_carriers(self):
+    stream = bytes(self.stream) + b'\xff\xff\xff'
+    limit = 8 * len(self.stream)
+    positions = self.positions
+    negative = self.negative
+    pos = 0
+    segment = 0
+
+    for mcu in range(self.mcu_count):
+      if self.restart_interval and mcu and mcu % self.restart_interval == 0:
+        # Marker restart: lanjut dari awal bagian berikutnya (prediktor DC tidak dipakai untuk pembawa)
+        segment += 1
+        pos = 8 * int(self.segment_starts[segment])
+
+      for dc_table, ac_table, blocks in self.scan:
+        for _ in range(blocks):
+          # Koefisien DC: simbol ukuran lalu bit selisih
+          peek = (int.from_bytes(stream[pos >> 3:(pos >> 3) + 3], 'big') >> (8 - (pos & 7))) & 0xFFFF
+          entry = dc_table[peek]
+          if not entry:
+            raise AppError("corrupt JPEG data")
+          pos += (entry >> 8) + (entry & 255)
+
+          # Koefisien AC: simbol (run, ukuran) lalu bit magnitude
+          k = 1
+          while k < 64:
+            peek = (int.from_bytes(stream[pos >> 3:(pos >> 3) + 3], 'big') >> (8 - (pos & 7))) & 0xFFFF
+            entry = ac_table[peek]
+            if not entry:
+              raise AppError("corrupt JPEG data")
+            pos += entry >> 8
+            run, size = (entry >> 4) & 15, entry & 15
+            if size == 0:
+              if run != 15:
+                break
+              k += 16
+              continue
+
+            if size >= 2:
+              # bit pertama magnitude 0 berarti nilai negatif
+              positions.append(pos + size - 1)
+              negative.append(1 - ((stream[pos >> 3] >> (7 - (pos & 7))) & 1))
+            pos += size
+            k += run + 1
+
+          if pos > limit:
+            raise AppError("corrupt JPEG data")
+          yield
+
+  # pastikan pembawa sampai nomor count sudah didekode (None: seluruh scan); mengembalikan jumlah yang tersedia
+  def ensure_carriers(self, count=None):
+    for _ in self.carriers:
+      if count is not None and len(self.positions) >= count:
+        break
+    return len(self.positions)
+
+  # open membaca file JPEG dari path atau bytes hanya untuk extract; data entropi tetap didekode bertahap
+  @classmethod
+  def open(cls, source, workers=1):
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+      with open(source, 'rb') as f:
+        source = f.read()
+    return cls(source, readonly=True)
+
+  # kapasitas JPEG bergantung pada isi koefisien, bukan hanya ukuran gambar; pakai payload_capacity()
+  @classmethod
+  def capacity(cls, shape, layout=0):
+    raise AppError("JPEG capacity depends on the image data, use payload_capacity()")
+
+  # kapasitas payload embed_bytes (dalam byte); bergantung pada isi koefisien, jadi seluruh scan didekode
+  def payload_capacity(self):
+    return max(0, (self.ensure_carriers() - self.header_bits()) // 8)
+
+  def fits(self, count):
+    return self.ensure_carriers(self.block_idx + count) >= self.block_idx + count
+
+  # urutan pembawa yang diacak dengan key mencakup seluruh scan, jadi seluruh scan didekode
+  def total_steps(self):
+    return self.ensure_carriers()
+
+  # posisi bit dan tanda untuk count pembawa berikutnya
+  def walk_index(self, count):
+    end = self.block_idx + count
+    if self.ensure_carriers(end) < end:
+      raise AppError("need larger image")
+
+    if self.permutation is not None:
+      steps = self.permuted_steps(end)
+      positions = np.array(self.positions, dtype=np.int64)[steps]
+      negative = np.array(self.negative, dtype=np.uint8)[steps]
+    else:
+      positions = np.array(self.positions[self.block_idx:end], dtype=np.int64)
+      negative = np.array(self.negative[self.block_idx:end], dtype=np.uint8)
+    self.block_idx = end
+    return positions, negative
+
+  # nilai bit magnitude terakhir pada posisi-posisi aliran bit
+  def raw_bits(self, positions):
+    stream = np.frombuffer(self.stream, dtype=np.uint8)
+    return (stream[positions >> 3] >> (7 - (positions & 7)).astype(np.uint8)) & 1
+
+  def extract_bits(self, count):
+    positions, negative = self.walk_index(count)
+    return self.raw_bits(positions) ^ negative
+
+  def embed_bits(self, bits, sparse=False):
+    self.check_writable()
+    positions, negative = self.walk_index(len(bits))
+    flip = positions[(self.raw_bits(positions) ^ negative) != bits]
+    stream = np.frombuffer(self.stream, dtype=np.uint8)
+    np.bitwise_xor.at(stream, flip >> 3, (1 << (7 - (flip & 7))).astype(np.uint8))
+
+  # susun kembali file JPEG dari aliran bit yang sudah diubah, dengan byte stuffing dan marker restart asli
+  def store(self):
+    scan = []
+    for i in range(len(self.segment_starts) - 1):
+      segment = bytes(self.stream[self.segment_starts[i]:self.segment_starts[i+1]])
+      scan.append(segment.replace(b'\xff', b'\xff\x00'))
+      if i < len(self.restart_markers):
+        scan.append(self.restart_markers[i])
+    scan = b''.join(scan)
+    self.data = self.data[:self.scan_start] + scan + self.data[self.scan_end:]
+    # byte stuffing bisa mengubah panjang scan; store berikutnya harus mengganti scan yang baru ini
+    self.scan_end = self.scan_start + len(scan)
+
+  def extract_legacy(self, start):
+    raise AppError("no payload found")
+
+  # simpan file JPEG ke dstPath
+  def save(self, dstPath):
+    with open(dstPath, 'wb') as f:
+      f.write(self.data)
+
+if __name__ == "__main__":
+  with jpeg_steg.open(sys.argv[1]) as obj:
+    print(obj.extract_bytes())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import struct
+import zlib
+import cv2
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# jumlah sampel per piksel untuk setiap color type PNG
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# satu chunk PNG lengkap dengan panjang dan CRC
+def png_chunk(kind, data):
+  return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+# png_rows membaca gambar dari path atau bytes hanya sampai baris yang diminta.
+# Data IDAT di-inflate bertahap seperlunya, lalu baris mentah (masih dengan byte filter) dibungkus ulang menjadi PNG
+# kecil dengan tinggi dipotong dan deflate tanpa kompresi, sehingga rekonstruksi filter dan konversi warna tetap
+# dikerjakan cv2 dan hasilnya identik dengan baris yang sama dari cv2.imdecode gambar penuh.
+# PNG interlace (Adam7) dan format selain PNG tidak bisa dibaca sebagian; partial bernilai False dan read_all()
+# mendekode seluruh gambar
+class png_rows():
+
+  def __init__(self, source):
+    if isinstance(source, (str, os.PathLike)):
+      self.file = open(source, 'rb')
+    else:
+      self.file = io.BytesIO(source)
+    self.partial = self.file.read(len(PNG_SIGNATURE)) == PNG_SIGNATURE and self.read_header()
+
+  # baca chunk sampai IDAT pertama; False jika gambar tidak bisa dibaca sebagian
+  def read_header(self):
+    self.ihdr = None
+    # chunk selain IHDR sebelum IDAT (misalnya PLTE), disalin apa adanya ke PNG potongan
+    self.chunks = []
+    while True:
+      head = self.file.read(8)
+      if len(head) < 8:
+        return False
+      length, kind = struct.unpack('>I4s', head)
+      if kind == b'IDAT':
+        self.idat_left = length
+        break
+      data = self.file.read(length)
+      crc = self.file.read(4)
+      if kind == b'IHDR':
+        self.ihdr = data
+      elif kind == b'IEND':
+        return False
+      else:
+        self.chunks.append(head + data + crc)
+
+    if self.ihdr is None:
+      return False
+    width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', self.ihdr)
+    if interlace or color not in PNG_CHANNELS:
+      return False
+
+    # cv2.IMREAD_COLOR selalu menghasilkan 3 channel BGR
+    self.shape = (height, width, 3)
+    # byte per baris mentah: satu byte tipe filter lalu sampel yang dipadatkan
+    self.stride = 1 + (width * PNG_CHANNELS[color] * depth + 7) // 8
+    self.decompressor = zlib.decompressobj()
+    self.raw = bytearray()
+    return True
+
+  # isi data IDAT berikutnya, atau b'' jika sudah habis
+  def next_idat(self):
+    if self.idat_left is None:
+      return b''
+    data = self.file.read(self.idat_left)
+    self.file.read(4)
+    head = self.file.read(8)
+    self.idat_left = None
+    if len(head) == 8:
+      length, kind = struct.unpack('>I4s', head)
+      if kind == b'IDAT':
+        self.idat_left = length
+    return data
+
+  # inflate sampai sedikitnya rows baris mentah tersedia (kurang jika datanya terpotong)
+  def inflate(self, rows):
+    need = rows * self.stride
+    while len(self.raw) < need:
+      data = self.decompressor.unconsumed_tail or self.next_idat()
+      if not data:
+        break
+      self.raw += self.decompressor.decompress(data, need - len(self.raw))
+
+  # mendekode rows baris pertama sebagai array uint8 (rows, lebar, 3); None jika data rusak atau terpotong
+  def read(self, rows):
+    rows = min(rows, self.shape[0])
+    self.inflate(rows)
+    if len(self.raw) < rows * self.stride:
+      return None
+
+    ihdr = struct.pack('>II', self.shape[1], rows) + self.ihdr[8:]
+    png = (PNG_SIGNATURE + png_chunk(b'IHDR', ihdr) + b''.join(self.chunks) +
+           png_chunk(b'IDAT', zlib.compress(self.raw[:rows * self.stride], 0)) + png_chunk(b'IEND', b''))
+    return cv2.imdecode(np.frombuffer(png, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+  # mendekode seluruh gambar dengan cv2.imdecode
+  def read_all(self):
+    self.file.seek(0)
+    return cv2.imdecode(np.frombuffer(self.file.read(), dtype=np.uint8), cv2.IMREAD_COLOR)
+
+  def close(self):
+    self.file.close()
@@ -3,6 +3,7 @@
 import numpy as np
 import cv2
 import math
+from dct import block_view
 
 def calculate_mse(original_image, stego_image):
     """
@@ -51,6 +52,55 @@ def calculate_psnr(original_image, stego_image):
     psnr = 20 * math.log10(max_pixel / math.sqrt(mse))
     return psnr
 
+def calculate_block_mse(original_image, stego_image, blocks, block_size=8):
+    """
+    Menghitung MSE antara dua gambar yang hanya berbeda pada blok tertentu
+
+    Hanya blok pada blocks yang dibaca, tetapi hasilnya dinormalisasi dengan jumlah
+    piksel seluruh gambar, sehingga sama dengan calculate_mse selama piksel di luar
+    blok tersebut identik (misalnya blok dari dct_steg.touched_blocks)
+
+    Args:
+        original_image: Gambar asli dalam bentuk array numpy
+        stego_image: Gambar yang dimodifikasi dalam bentuk array numpy
+        blocks: Tuple (baris blok, kolom blok, channel) berisi array indeks blok
+        block_size: Ukuran blok dalam piksel
+
+    Returns:
+        Nilai MSE (float)
+    """
+    if original_image.shape != stego_image.shape:
+        raise ValueError("Images must have the same dimensions")
+
+    rows, cols, channel = blocks
+    original = block_view(original_image, block_size)[rows, cols, channel].astype(np.int32)
+    stego = block_view(stego_image, block_size)[rows, cols, channel].astype(np.int32)
+
+    # Jumlah kuadrat selisih dalam integer (tepat), dibagi jumlah piksel seluruh gambar
+    diff = original - stego
+    return float(np.einsum('ijk,ijk->', diff, diff, dtype=np.int64)) / original_image.size
+
+def calculate_block_psnr(original_image, stego_image, blocks, block_size=8):
+    """
+    Menghitung PSNR dari calculate_block_mse (lihat keterangannya)
+
+    Args:
+        original_image: Gambar asli dalam bentuk array numpy
+        stego_image: Gambar yang dimodifikasi dalam bentuk array numpy
+        blocks: Tuple (baris blok, kolom blok, channel) berisi array indeks blok
+        block_size: Ukuran blok dalam piksel
+
+    Returns:
+        Nilai PSNR dalam dB (float)
+    """
+    mse = calculate_block_mse(original_image, stego_image, blocks, block_size)
+
+    # Menangani kasus jika gambar identik
+    if mse == 0:
+        return float('inf')
+
+    return 20 * math.log10(255.0 / math.sqrt(mse))
+
 if __name__ == "__main__":
     # Contoh
     original = cv2.imread('original.png')
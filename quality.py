@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from psnr import calculate_block_mse
+from ssim import ssim_scratch, structural_similarity
+
+class QualityEngine:
+    """
+    Menghitung MSE, PSNR dan SSIM sekaligus dalam satu pemanggilan
+
+    Hasilnya sama dengan calculate_psnr dan calculate_ssim (SSIM grayscale dengan
+    jendela seragam 7x7), tetapi konversi grayscale hanya dilakukan sekali, semua
+    perhitungan SSIM memakai buffer float32 yang disimpan di engine dan dipakai ulang,
+    dan peta SSIM penuh tidak pernah dibuat terpisah.
+    """
+
+    def __init__(self, win_size=7, data_range=255.0, shape=None):
+        """
+        Args:
+            win_size: Ukuran jendela SSIM (ganjil)
+            data_range: Rentang nilai piksel (255 untuk gambar 8-bit)
+            shape: Ukuran gambar (tinggi, lebar) untuk menyiapkan buffer sejak awal
+        """
+        self.win_size = win_size
+        self.data_range = data_range
+        self.scratch = None
+        self.lock = threading.Lock()
+        if shape is not None:
+            self.prepare(shape)
+
+    def prepare(self, shape):
+        """
+        Menyiapkan buffer kerja untuk gambar berukuran shape; buffer hanya dibuat ulang
+        jika ukurannya berubah
+
+        Args:
+            shape: Ukuran gambar (tinggi, lebar[, channel])
+        """
+        shape = tuple(shape[:2])
+        if self.scratch is not None and self.scratch['x'].shape == shape:
+            return
+        self.scratch = ssim_scratch(shape)
+        self.scratch['gray_x'] = np.empty(shape, dtype=np.uint8)
+        self.scratch['gray_y'] = np.empty(shape, dtype=np.uint8)
+
+    def measure(self, original_image, stego_image, blocks=None):
+        """
+        Menghitung MSE, PSNR dan SSIM antara dua gambar
+
+        Args:
+            original_image: Gambar asli dalam bentuk array numpy (BGR atau grayscale, uint8)
+            stego_image: Gambar yang dimodifikasi dalam bentuk array numpy
+            blocks: Blok yang berubah dari dct_steg.touched_blocks (opsional); MSE dan PSNR
+                    hanya dihitung dari blok tersebut (lihat calculate_block_mse)
+
+        Returns:
+            Dict berisi 'mse', 'psnr' (dB) dan 'ssim'
+        """
+        if original_image.shape != stego_image.shape:
+            raise ValueError("Images must have the same dimensions")
+
+        # MSE dihitung cv2 langsung dari kedua gambar tanpa salinan float
+        if blocks is not None:
+            mse = calculate_block_mse(original_image, stego_image, blocks)
+        else:
+            mse = round(cv2.norm(original_image, stego_image, cv2.NORM_L2SQR)) / original_image.size
+        psnr = float('inf') if mse == 0 else 20 * math.log10(self.data_range / math.sqrt(mse))
+
+        with self.lock:
+            ssim = self.ssim(original_image, stego_image)
+        return {'mse': mse, 'psnr': psnr, 'ssim': ssim}
+
+    def ssim(self, original_image, stego_image):
+        """SSIM rata-rata grayscale dengan buffer engine (pemanggil memegang self.lock)"""
+        self.prepare(original_image.shape)
+        buf = self.scratch
+
+        # Konversi grayscale sekali per gambar, langsung ke buffer
+        if original_image.ndim == 3:
+            cv2.cvtColor(original_image, cv2.COLOR_BGR2GRAY, dst=buf['gray_x'])
+            cv2.cvtColor(stego_image, cv2.COLOR_BGR2GRAY, dst=buf['gray_y'])
+            original_image, stego_image = buf['gray_x'], buf['gray_y']
+        return structural_similarity(original_image, stego_image, self.win_size,
+                                     data_range=self.data_range, scratch=buf)
+
+    def measure_tiled(self, original_image, stego_image, band_rows=256, workers=None):
+        """
+        Menghitung MSE, PSNR dan SSIM per pita baris untuk gambar yang sangat besar
+
+        Setiap pita dibaca sendiri (gambar boleh np.memmap, atau path file .npy yang dibuka
+        dengan mmap), sehingga memori hanya sebesar beberapa pita. Jumlah kuadrat selisih
+        diakumulasi sebagai integer, dan SSIM setiap pita dihitung dengan tambahan baris
+        sebesar jari-jari jendela di atas dan bawahnya, sehingga hasilnya sama dengan measure()
+        pada gambar utuh. Pita dikerjakan paralel di thread pool (cv2 melepas GIL).
+
+        Args:
+            original_image: Gambar asli (array, np.memmap atau path .npy)
+            stego_image: Gambar yang dimodifikasi (array, np.memmap atau path .npy)
+            band_rows: Jumlah baris gambar per pita
+            workers: Jumlah thread (bawaan: jumlah CPU)
+
+        Returns:
+            Dict berisi 'mse', 'psnr' (dB) dan 'ssim'
+        """
+        if isinstance(original_image, str):
+            original_image = np.load(original_image, mmap_mode='r')
+        if isinstance(stego_image, str):
+            stego_image = np.load(stego_image, mmap_mode='r')
+        if original_image.shape != stego_image.shape:
+            raise ValueError("Images must have the same dimensions")
+
+        height, width = original_image.shape[:2]
+        pad = (self.win_size - 1) // 2
+        if min(height, width) < self.win_size:
+            raise ValueError("image is smaller than the SSIM window")
+
+        # Buffer SSIM terpisah untuk setiap thread
+        local = threading.local()
+
+        def gray(image):
+            if image.ndim == 3:
+                return cv2.cvtColor(np.ascontiguousarray(image), cv2.COLOR_BGR2GRAY)
+            return image
+
+        def measure_band(start):
+            end = min(start + band_rows, height)
+            # cv2.norm mengembalikan float yang bisa meleset sangat sedikit dari jumlah integer sebenarnya
+            squared = round(cv2.norm(np.ascontiguousarray(original_image[start:end]),
+                                     np.ascontiguousarray(stego_image[start:end]), cv2.NORM_L2SQR))
+
+            # Baris keluaran SSIM pita ini, dibaca bersama pad baris di sekitarnya
+            first, last = max(start, pad), min(end, height - pad)
+            if first >= last:
+                return squared, 0.0
+            x = gray(original_image[first - pad:last + pad])
+            y = gray(stego_image[first - pad:last + pad])
+            local.scratch = ssim_scratch(x.shape, getattr(local, 'scratch', None))
+            mean = structural_similarity(x, y, self.win_size, data_range=self.data_range, scratch=local.scratch)
+            return squared, mean * (last - first) * (width - 2 * pad)
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = list(pool.map(measure_band, range(0, height, band_rows)))
+
+        mse = sum(squared for squared, _ in results) / original_image.size
+        psnr = float('inf') if mse == 0 else 20 * math.log10(self.data_range / math.sqrt(mse))
+        ssim = sum(total for _, total in results) / ((height - 2 * pad) * (width - 2 * pad))
+        return {'mse': mse, 'psnr': psnr, 'ssim': ssim}
+
+if __name__ == "__main__":
+    # Contoh
+    original = cv2.imread('original.png')
+    stego = cv2.imread('stego.png')
+
+    if original is not None and stego is not None:
+        result = QualityEngine().measure(original, stego)
+        print(f"MSE: {result['mse']:.4f}")
+        print(f"PSNR: {result['psnr']:.2f} dB")
+        print(f"SSIM: {result['ssim']:.4f}")
+    else:
+        print("Error loading images")
@@ -1,26 +1,133 @@
 #!/usr/bin/env python3
 import cv2
 import numpy as np
-import os
-from dct import dct_steg
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dct import dct_steg, grid_steps
 from aes import AESCipher
+from jpeg_sim import read_block_bits, simulate_bits, verify_bits
+
+# Registry serangan: nama -> (fungsi serangan, key gambar hasil di dictionary hasil uji, field noise).
+# Fungsi serangan menerima (gambar, parameter) berupa array NumPy dan mengembalikan gambar baru
+# yang diserang tanpa mengubah gambar masukan; semuanya berjalan di memori, tanpa file sementara.
+ATTACKS = {}
+# Field noise acak yang bisa dibagi antar parameter: 'normal' (normal standar float32 seukuran gambar) dan
+# 'uniform' (uniform [0, 1) float32 seukuran bidang gambar), lihat RobustnessTest.noise_field
+NOISE_FIELDS = ('normal', 'uniform')
+
+def register_attack(name, attack, image_key='attacked_image', field=None):
+    """
+    Daftarkan jenis serangan baru agar bisa dipakai RobustnessTest.run_case dan run_suite
+    
+    Parameter:
+    name -- Nama jenis serangan (key di spec run_suite)
+    attack -- Fungsi attack(image, param) -> gambar hasil serangan (numpy array)
+    image_key -- Key gambar hasil serangan di dictionary hasil uji
+    field -- Nama field noise di NOISE_FIELDS; jika diisi, RobustnessTest memanggil
+             attack(image, param, field=array) dengan field yang sama untuk semua parameter
+    """
+    if field is not None and field not in NOISE_FIELDS:
+        raise ValueError(f"Unknown noise field: {field}")
+    ATTACKS[name] = (attack, image_key, field)
+
+def resize_attack(image, factor):
+    """Perkecil/perbesar gambar dengan faktor tertentu lalu kembalikan ke ukuran semula"""
+    height, width = image.shape[:2]
+    new_height = int(height * factor)
+    new_width = int(width * factor)
+    
+    # Resize down
+    resized_down = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    # Resize back to original
+    return cv2.resize(resized_down, (width, height), interpolation=cv2.INTER_CUBIC)
+
+def gaussian_attack(image, stddev, field=None):
+    """
+    Tambahkan Gaussian noise dengan standar deviasi tertentu; field adalah noise normal standar float32
+    seukuran gambar (atau tumpukan (T, H, W, C)) yang cukup diskalakan (bawaan: diambil baru dari np.random)
+    """
+    if field is None:
+        field = np.random.standard_normal(image.shape).astype(np.float32)
+    noisy_image = field * np.float32(stddev)
+    noisy_image += image
+    return np.clip(noisy_image, 0, 255, out=noisy_image).astype(np.uint8)
+
+def salt_pepper_attack(image, density, field=None):
+    """
+    Tambahkan Salt and Pepper noise dengan densitas tertentu; field adalah noise uniform [0, 1) seukuran
+    bidang gambar yang diberi ambang: di bawah density/2 menjadi salt, antara density/2 dan density menjadi
+    pepper (bawaan: diambil baru dari np.random)
+    """
+    if field is None:
+        field = np.random.random_sample(image.shape[:2]).astype(np.float32)
+    # field boleh bertumpuk (T, H, W) untuk banyak percobaan sekaligus; hasilnya (T, H, W, C)
+    noisy_image = np.broadcast_to(image, field.shape + image.shape[2:]).copy()
+    salt_mask = field < np.float32(density / 2)
+    pepper_mask = ~salt_mask & (field < np.float32(density))
+    
+    # Terapkan salt
+    noisy_image[salt_mask] = 255
+    # Terapkan pepper
+    noisy_image[pepper_mask] = 0
+    return noisy_image
+
+def jpeg_attack(image, quality):
+    """Kompresi JPEG dengan kualitas tertentu, di-encode dan di-decode di memori"""
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+
+register_attack('resize', resize_attack, 'resized_image')
+register_attack('gaussian', gaussian_attack, 'noisy_image', 'normal')
+register_attack('salt_pepper', salt_pepper_attack, 'noisy_image', 'uniform')
+register_attack('jpeg', jpeg_attack, 'compressed_image')
 
 class RobustnessTest:
-    def __init__(self, original_image, encoded_image, cipher_text, key):
+    # Parameter bawaan setiap jenis serangan, dipakai run_suite dan aplikasi web
+    DEFAULT_SUITE = {
+        'resize': [0.5, 0.75, 0.9, 1.1, 1.25, 1.5],
+        'gaussian': [5, 10, 15, 20, 25],
+        'salt_pepper': [0.01, 0.02, 0.05, 0.1, 0.15],
+        'jpeg': [100, 90, 80, 70, 60, 50, 40, 30],
+    }
+    # Batas memori kerja bawaan untuk satu tumpukan percobaan (trials)
+    TRIAL_MEMORY = 256 << 20
+    # z untuk interval kepercayaan 95% (Wilson) dari tingkat keberhasilan percobaan
+    CONFIDENCE_Z = 1.96
+
+    def __init__(self, original_image, encoded_image, cipher_text, key, mode='decode', seed=None):
         """
         Inisialisasi pengujian robustness dengan data yang diperlukan
         
         Parameter:
         original_image -- Gambar asli (numpy array)
         encoded_image -- Gambar hasil steganografi (numpy array)
-        cipher_text -- Teks terenkripsi yang disisipkan ke dalam gambar
+        cipher_text -- Ciphertext (byte mentah) yang disisipkan ke dalam gambar
         key -- Kunci enkripsi AES
+        mode -- 'decode': ekstrak dan dekripsi pesan (berhasil/gagal);
+                'ber': bandingkan bit yang terbaca dengan bit yang disisipkan dan laporkan bit error rate
+                header dan payload secara terpisah (hanya untuk payload format biner)
+        seed -- Seed atau np.random.Generator untuk field noise; seed yang sama memberi hasil yang sama
         """
+        if mode not in ('decode', 'ber'):
+            raise ValueError(f"Unknown test mode: {mode}")
         self.original_image = original_image
         self.encoded_image = encoded_image
         self.cipher_text = cipher_text
         self.key = key
         self.cipher = AESCipher(key)
+        self.mode = mode
+        self.rng = np.random.default_rng(seed)
+        # Field noise dibuat sekali (lihat noise_field) lalu dipakai ulang untuk semua parameter. Setiap field
+        # punya seed sendiri supaya isinya tidak bergantung pada urutan field dibuat
+        self.field_seeds = dict(zip(NOISE_FIELDS, self.rng.integers(2**63, size=len(NOISE_FIELDS))))
+        self.fields = {}
+        # Seed noise percobaan berulang (trials); setiap pemanggilan mulai dari seed yang sama
+        self.trial_seed = self.rng.integers(2**63)
+        # Blok dan bit yang disisipkan untuk mode 'ber', dihitung sekali dan dipakai semua uji
+        self.reference = self._reference_bits() if mode == 'ber' else None
         
     def _extract_and_compare(self, attacked_image):
         """
@@ -32,52 +139,130 @@ class RobustnessTest:
         error -- Error message (if not successful)
         """
         try:
-            obj = dct_steg(attacked_image)
-            extracted_cipher = obj.extract()
+            obj = dct_steg(attacked_image, readonly=True)
+            extracted_cipher = obj.extract_bytes(self.key)
+
+            # Gambar format lama menyimpan ciphertext sebagai teks heksadesimal
+            if obj.version == dct_steg.FORMAT_LEGACY:
+                extracted_cipher = extracted_cipher.decode('ascii')
+            
+            # Bandingkan dengan ciphertext yang disisipkan; serangan bisa membuat header terbaca sebagai format
+            # lama dengan panjang 0, yang "didekripsi" menjadi pesan kosong tanpa error
+            expected = self.cipher_text
+            if isinstance(extracted_cipher, str) and isinstance(expected, (bytes, bytearray)):
+                expected = expected.hex()
+            if extracted_cipher != expected:
+                return False, None, "extracted ciphertext does not match the embedded one"
             
             # Decrypt the message
-            decrypted_message = self.cipher.decrypt(extracted_cipher)
-            decoded_message = decrypted_message.decode('utf-8').rstrip()
+            decoded_message = self.cipher.decrypt_message(extracted_cipher)
             
             # If we get here, extraction was successful
             return True, decoded_message, None
         except Exception as e:
             return False, None, str(e)
+
+    def noise_field(self, field):
+        """
+        Field noise bersama untuk gambar ini, dibuat sekali dari seed field tersebut
+        
+        Parameter:
+        field -- 'normal': normal standar float32 (H, W, C); 'uniform': uniform [0, 1) float32 (H, W)
+        
+        Return:
+        Array field noise (jangan diubah; dipakai ulang oleh semua uji)
+        """
+        if field not in self.fields:
+            if field not in NOISE_FIELDS:
+                raise ValueError(f"Unknown noise field: {field}")
+            rng = np.random.default_rng(self.field_seeds[field])
+            if field == 'normal':
+                noise = rng.standard_normal(self.encoded_image.shape, dtype=np.float32)
+            else:
+                noise = rng.random(self.encoded_image.shape[:2], dtype=np.float32)
+            noise.setflags(write=False)
+            self.fields[field] = noise
+        return self.fields[field]
+
+    def _reference_bits(self):
+        """
+        Blok header dan payload beserta bit yang seharusnya terbaca di dalamnya
+        
+        Return:
+        reference -- List (rows, cols, channel, layout, bit) untuk header lalu payload
+        """
+        header, segments = self._payload_blocks()
+        payload = np.frombuffer(self.cipher_text, dtype=np.uint8)
+        if header['length'] != len(payload) or header['crc'] != zlib.crc32(payload):
+            raise ValueError("encoded image does not carry cipher_text")
+        
+        # Header disusun ulang seperti dct_steg.embed_bytes
+        fields = struct.pack(dct_steg.CHECKED_HEADER, dct_steg.FORMAT_MARKER, dct_steg.FORMAT_CHECKED,
+                             header['flags'], len(payload), header['crc'])
+        header_bytes = fields + struct.pack(dct_steg.HEADER_CHECK, zlib.crc32(fields) & 0xFFFF)
+        bits = [np.unpackbits(np.frombuffer(header_bytes, dtype=np.uint8)), np.unpackbits(payload)]
+        return [segment + (expected,) for segment, expected in zip(segments, bits)]
+
+    def _measure_ber(self, attacked_image):
+        """
+        Hitung bit error rate header dan payload dari gambar yang telah diserang; hanya blok sepanjang
+        payload yang disisipkan yang dibaca, tanpa membaca panjang dari header yang mungkin rusak
+        
+        Returns:
+        result -- Dictionary berisi success (semua bit benar), header_ber, payload_ber, ber dan errors
+        """
+        errors = []
+        for rows, cols, channel, layout, expected in self.reference:
+            bits = read_block_bits(attacked_image, rows, cols, channel, layout).ravel()[:len(expected)]
+            errors.append(int(np.count_nonzero(bits != expected)))
+        
+        header_bits, payload_bits = (len(expected) for *_, expected in self.reference)
+        header_errors, payload_errors = errors
+        success = header_errors == 0 and payload_errors == 0
+        return {
+            'success': success,
+            'message': None,
+            'error': None if success else f"{header_errors + payload_errors} bit errors",
+            'header_ber': header_errors / header_bits,
+            'payload_ber': payload_errors / payload_bits if payload_bits else 0.0,
+            'ber': (header_errors + payload_errors) / (header_bits + payload_bits),
+            'errors': header_errors + payload_errors
+        }
     
-    def resize_test(self, factors):
+    def resize_test(self, factors, trials=None, jitter=0.0, memory_budget=None):
         """
         Test robustness against image resizing
         
         Parameters:
         factors -- List of resize factors (e.g., [0.5, 0.75, 1.25, 1.5])
+        trials -- Number of trials per factor; returns statistics instead of images (see _trial_stats)
+        jitter -- Relative random change of the factor per trial, e.g. 0.02 for factor * U(0.98, 1.02).
+                  Resizing itself is deterministic, so without jitter the attack is run only once and
+                  reported as a single trial with a degenerate interval
+        memory_budget -- Byte limit for one batch of trials (default TRIAL_MEMORY)
         
         Returns:
         results -- Dictionary with test results
         """
-        results = {}
+        if trials is None:
+            return {factor: self.run_case('resize', factor) for factor in factors}
         
+        rng = np.random.default_rng(self.trial_seed)
+        results = {}
         for factor in factors:
-            height, width = self.encoded_image.shape[:2]
-            new_height = int(height * factor)
-            new_width = int(width * factor)
-            
-            # Resize down
-            resized_down = cv2.resize(self.encoded_image, (new_width, new_height), interpolation=cv2.INTER_AREA)
-            # Resize back to original
-            resized_back = cv2.resize(resized_down, (width, height), interpolation=cv2.INTER_CUBIC)
-            
-            success, message, error = self._extract_and_compare(resized_back)
+            if not jitter:
+                errors = self._batch_errors(resize_attack(self.encoded_image, factor)[None])
+                results[factor] = self._trial_stats(errors, deterministic=True)
+                continue
             
-            results[factor] = {
-                'success': success,
-                'message': message if success else None,
-                'error': error if not success else None,
-                'resized_image': resized_back
-            }
-        
+            errors = []
+            for count in self._trial_batches(trials, 2 * self.encoded_image.nbytes, memory_budget):
+                scaled = factor * (1 + rng.uniform(-jitter, jitter, count))
+                errors.append(self._batch_errors(np.stack([resize_attack(self.encoded_image, f) for f in scaled])))
+            results[factor] = self._trial_stats(np.concatenate(errors))
         return results
     
-    def noise_test(self, noise_type, params):
+    def noise_test(self, noise_type, params, trials=None, memory_budget=None):
         """
         Uji robustness terhadap noise
         
@@ -87,53 +272,98 @@ class RobustnessTest:
             Untuk gaussian: list standar deviasi
             Untuk salt_pepper: list densitas noise
         
+        trials -- Jumlah percobaan per parameter dengan noise baru setiap percobaan; mengembalikan
+                  statistik, bukan gambar (lihat _trial_stats)
+        memory_budget -- Batas byte untuk satu tumpukan percobaan (bawaan TRIAL_MEMORY)
+        
+        Semua parameter memakai field noise yang sama (lihat noise_field), sehingga hasilnya
+        hanya bergantung pada seed dan hanya berbeda karena skala/ambang noise. Dengan trials,
+        noise dibuat bertumpuk (T, H, W, C) per potongan sesuai memory_budget, dan setiap tumpukan
+        juga dipakai untuk semua parameter
+        
         Return:
         results -- Dictionary berisi hasil uji
         """
-        results = {}
+        if noise_type not in ('gaussian', 'salt_pepper'):
+            return {param: {
+                'success': False,
+                'message': None,
+                'error': f"Unknown noise type: {noise_type}",
+                'noisy_image': self.encoded_image.copy()
+            } for param in params}
         
+        if trials is None:
+            return {param: self.run_case(noise_type, param) for param in params}
         
-        for param in params:
-            noisy_image = self.encoded_image.copy()
-            
-            if noise_type == 'gaussian':
-                # Tambahkan Gaussian noise
-                mean = 0
-                stddev = param
-                noise = np.random.normal(mean, stddev, noisy_image.shape).astype(np.float32)
-                noisy_image = noisy_image.astype(np.float32) + noise
-                noisy_image = np.clip(noisy_image, 0, 255).astype(np.uint8)
-            
-            elif noise_type == 'salt_pepper':
-                # Tambahkan Salt and Pepper noise
-                density = param
-                salt_mask = np.random.rand(*noisy_image.shape[:2]) < (density / 2)
-                pepper_mask = np.random.rand(*noisy_image.shape[:2]) < (density / 2)
-                
-                # Terapkan salt
-                noisy_image[salt_mask] = 255
-                # Terapkan pepper
-                noisy_image[pepper_mask] = 0
-
+        attack, _, field = ATTACKS[noise_type]
+        rng = np.random.default_rng(self.trial_seed)
+        shape = self.encoded_image.shape
+        errors = {param: [] for param in params}
+        # Per percobaan: field float32, salinan kerja float32 dan gambar uint8 hasil serangan
+        for count in self._trial_batches(trials, 9 * self.encoded_image.size, memory_budget):
+            if field == 'normal':
+                noise = rng.standard_normal((count,) + shape, dtype=np.float32)
             else:
-                results[param] = {
-                    'success': False,
-                    'message': None,
-                    'error': f"Unknown noise type: {noise_type}",
-                    'noisy_image': noisy_image
-                }
-                continue
-            
-            success, message, error = self._extract_and_compare(noisy_image)
-            
-            results[param] = {
-                'success': success,
-                'message': message if success else None,
-                'error': error if not success else None,
-                'noisy_image': noisy_image
-            }
+                noise = rng.random((count,) + shape[:2], dtype=np.float32)
+            for param in params:
+                errors[param].append(self._batch_errors(attack(self.encoded_image, param, field=noise)))
+        return {param: self._trial_stats(np.concatenate(errors[param])) for param in params}
+
+    def _trial_batches(self, trials, bytes_per_trial, memory_budget=None):
+        """Ukuran setiap tumpukan percobaan supaya satu tumpukan tidak melebihi memory_budget"""
+        if trials < 1:
+            raise ValueError("trials must be at least 1")
+        batch = max(1, int((memory_budget or self.TRIAL_MEMORY) // max(1, bytes_per_trial)))
+        return [min(batch, trials - start) for start in range(0, trials, batch)]
+
+    def _batch_errors(self, images):
+        """
+        Jumlah bit error header dan payload untuk setiap gambar dalam tumpukan (T, H, W, C); semua gambar
+        dibaca sekaligus
         
-        return results
+        Return:
+        errors -- Array int (T, 2): error header dan error payload
+        """
+        if self.reference is None:
+            self.reference = self._reference_bits()
+        errors = []
+        for rows, cols, channel, layout, expected in self.reference:
+            bits = read_block_bits(images, rows, cols, channel, layout).reshape(len(images), -1)
+            errors.append(np.count_nonzero(bits[:, :len(expected)] != expected, axis=1))
+        return np.stack(errors, axis=1)
+
+    def _trial_stats(self, errors, deterministic=False):
+        """
+        Ringkasan percobaan dari error per percobaan; satu percobaan berhasil jika semua bit benar (payload
+        dengan bit salah selalu gagal diekstrak karena CRC)
+        
+        Parameter:
+        errors -- Array (trials, 2) jumlah bit salah header dan payload per percobaan
+        deterministic -- Serangan tanpa keacakan; hasilnya pasti sehingga ci = (success_rate, success_rate)
+        
+        Return:
+        stats -- Dictionary berisi trials, successes, success_rate, ci (interval Wilson 95% untuk
+                 success_rate), mean_ber, header_ber dan payload_ber (rata-rata semua percobaan)
+        """
+        header_bits, payload_bits = (len(expected) for *_, expected in self.reference)
+        trials = len(errors)
+        successes = int(np.count_nonzero(errors.sum(axis=1) == 0))
+        rate = successes / trials
+        if deterministic:
+            center, margin = rate, 0.0
+        else:
+            z = self.CONFIDENCE_Z
+            center = (rate + z * z / (2 * trials)) / (1 + z * z / trials)
+            margin = z * np.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / (1 + z * z / trials)
+        return {
+            'trials': trials,
+            'successes': successes,
+            'success_rate': rate,
+            'ci': (float(max(0.0, center - margin)), float(min(1.0, center + margin))),
+            'mean_ber': float(errors.sum(axis=1).mean() / (header_bits + payload_bits)),
+            'header_ber': float(errors[:, 0].mean() / header_bits),
+            'payload_ber': float(errors[:, 1].mean() / payload_bits) if payload_bits else 0.0
+        }
     
     def jpeg_compression_test(self, qualities):
         """
@@ -145,27 +375,130 @@ class RobustnessTest:
         Return:
         results -- Dictionary berisi hasil uji
         """
-        results = {}
+        return {quality: self.run_case('jpeg', quality) for quality in qualities}
+
+    def _payload_blocks(self):
+        """
+        Blok yang membawa header dan payload pada gambar stego, dibaca dari headernya
         
-        for quality in qualities:
-            temp_jpg = "temp_compressed.jpg"
-            
-            # Simpan gambar dengan kualitas tertentu
-            cv2.imwrite(temp_jpg, self.encoded_image, [cv2.IMWRITE_JPEG_QUALITY, quality])
-            
-            # Baca kembali gambar yang dikompresi
-            compressed_image = cv2.imread(temp_jpg)
-            
-            if os.path.exists(temp_jpg):
-                os.remove(temp_jpg)
-            
-            success, message, error = self._extract_and_compare(compressed_image)
-            
+        Return:
+        header -- Dictionary header dari dct_steg.read_header
+        segments -- List (rows, cols, channel, layout): blok header lalu blok payload
+        """
+        obj = dct_steg(self.encoded_image, readonly=True)
+        header = obj.read_header()
+        if header is None:
+            raise ValueError("legacy payloads cannot be simulated")
+        
+        # Header selalu berurutan dengan layout 0 mulai dari langkah pertama
+        head = grid_steps(tuple(self.encoded_image.shape), np.arange(obj.block_idx))
+        if header['permuted']:
+            obj.set_key(self.key, obj.block_idx)
+        payload = obj.walk_index(obj.layout_steps(8 * header['length'], header['layout']))
+        return header, [head + (0,), payload + (header['layout'],)]
+
+    def jpeg_simulation(self, qualities, verify=False, subsample=True):
+        """
+        Perkirakan hasil kompresi JPEG untuk banyak kualitas sekaligus tanpa codec (lihat jpeg_sim.simulate_bits);
+        hanya blok yang membawa header dan payload yang dihitung
+        
+        Parameter:
+        qualities -- List nilai kualitas JPEG (1-100)
+        verify -- True untuk juga menjalankan codec sungguhan (cv2.imencode/imdecode) sebagai pembanding
+        subsample -- Chroma 4:2:0 seperti cv2.imwrite bawaan (True) atau 4:4:4 (False)
+        
+        Return:
+        results -- Dictionary per kualitas berisi success (tidak ada bit yang berubah), flips, bits dan ber;
+                   dengan verify juga verified_success, verified_flips dan verified_ber dari codec
+        """
+        flips = np.zeros(len(qualities), dtype=np.int64)
+        verified = np.zeros(len(qualities), dtype=np.int64)
+        total = 0
+        _, segments = self._payload_blocks()
+        for rows, cols, channel, layout in segments:
+            reference = read_block_bits(self.encoded_image, rows, cols, channel, layout)
+            simulated = simulate_bits(self.encoded_image, rows, cols, channel, layout, qualities, subsample)
+            flips += (simulated != reference).sum(axis=(1, 2))
+            if verify:
+                verified += (verify_bits(self.encoded_image, rows, cols, channel, layout, qualities)
+                             != reference).sum(axis=(1, 2))
+            total += reference.size
+        
+        results = {}
+        for i, quality in enumerate(qualities):
             results[quality] = {
+                'success': bool(flips[i] == 0),
+                'flips': int(flips[i]),
+                'bits': total,
+                'ber': flips[i] / total if total else 0.0
+            }
+            if verify:
+                results[quality].update({
+                    'verified_success': bool(verified[i] == 0),
+                    'verified_flips': int(verified[i]),
+                    'verified_ber': verified[i] / total if total else 0.0
+                })
+        return results
+
+    def run_case(self, test_type, param):
+        """
+        Jalankan satu uji (jenis serangan dan parameternya)
+        
+        Parameter:
+        test_type -- Nama serangan di ATTACKS ('resize', 'gaussian', 'salt_pepper', 'jpeg'
+                     atau yang didaftarkan dengan register_attack)
+        param -- Parameter serangan (faktor, standar deviasi, densitas, kualitas, ...)
+        
+        Return:
+        result -- Dictionary berisi success, message, error dan gambar hasil serangan; pada mode 'ber'
+                  juga header_ber, payload_ber, ber dan errors (lihat _measure_ber)
+        """
+        if test_type not in ATTACKS:
+            raise ValueError(f"Unknown test type: {test_type}")
+        attack, image_key, field = ATTACKS[test_type]
+        if field is None:
+            attacked_image = attack(self.encoded_image, param)
+        else:
+            attacked_image = attack(self.encoded_image, param, field=self.noise_field(field))
+        
+        if self.mode == 'ber':
+            result = self._measure_ber(attacked_image)
+        else:
+            success, message, error = self._extract_and_compare(attacked_image)
+            result = {
                 'success': success,
                 'message': message if success else None,
-                'error': error if not success else None,
-                'compressed_image': compressed_image
+                'error': error if not success else None
             }
+        result[image_key] = attacked_image
+        return result
+
+    def run_suite(self, spec=None, workers=None, processes=False):
+        """
+        Jalankan banyak uji sekaligus secara paralel
         
-        return results
+        Parameter:
+        spec -- Dictionary {jenis serangan: list parameter}; bawaan DEFAULT_SUITE (semua jenis)
+        workers -- Jumlah worker pool (bawaan dari concurrent.futures)
+        processes -- True untuk ProcessPoolExecutor, False untuk ThreadPoolExecutor
+                     (cv2 dan NumPy melepas GIL, jadi thread biasanya cukup)
+        
+        Return:
+        Generator (jenis serangan, parameter, hasil) dalam urutan selesainya uji
+        """
+        if spec is None:
+            spec = self.DEFAULT_SUITE
+        for test_type in spec:
+            if test_type not in ATTACKS:
+                raise ValueError(f"Unknown test type: {test_type}")
+            # Field noise dibuat sebelum pool berjalan supaya semua worker memakai field yang sama
+            if ATTACKS[test_type][2] is not None:
+                self.noise_field(ATTACKS[test_type][2])
+
+        pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            futures = {pool.submit(self.run_case, test_type, param): (test_type, param)
+                       for test_type, params in spec.items() for param in params}
+            for future in as_completed(futures):
+                test_type, param = futures[future]
+                yield test_type, param, future.result()
@@ -1,24 +1,198 @@
 # ssim.py
 
+import sys
 import cv2
 import numpy as np
-from skimage.metrics import structural_similarity as ssim
 
-def calculate_ssim(original_image, stego_image):
+# Konstanta SSIM (Wang et al. 2004), sama dengan nilai bawaan skimage
+K1 = 0.01
+K2 = 0.03
+# Jendela gaussian seperti skimage dengan gaussian_weights=True: sigma 1.5, dipotong pada 3.5 sigma
+GAUSSIAN_SIGMA = 1.5
+GAUSSIAN_WIN_SIZE = 11
+# Nama buffer float32 yang dipakai structural_similarity
+SCRATCH_NAMES = ('x', 'y', 'ux', 'uy', 'uxx', 'uyy', 'uxy', 'tmp')
+
+def ssim_scratch(shape, scratch=None):
+    """
+    Menyiapkan buffer kerja float32 untuk structural_similarity.
+
+    Argumen:
+    shape (tuple): Ukuran gambar 2D (tinggi, lebar).
+    scratch (dict): Buffer sebelumnya; dipakai ulang jika ukurannya sama.
+
+    Pengembalian:
+    dict: Buffer float32 untuk setiap nama di SCRATCH_NAMES.
+    """
+    if scratch is not None and all(name in scratch for name in SCRATCH_NAMES) and scratch['x'].shape == shape:
+        return scratch
+    return {name: np.empty(shape, dtype=np.float32) for name in SCRATCH_NAMES}
+
+def structural_similarity(x_image, y_image, win_size=7, gaussian=False, data_range=255.0, scratch=None):
+    """
+    Hitung SSIM rata-rata dua gambar 2D dengan filter cv2 separable dalam float32.
+
+    Hasilnya sama dengan skimage.metrics.structural_similarity dengan parameter bawaan
+    (jendela seragam win_size, kovarians sampel), atau dengan gaussian_weights=True
+    (jendela gaussian 11x11, sigma 1.5) jika gaussian=True.
+
+    Argumen:
+    x_image (numpy.ndarray): Gambar pertama (2D).
+    y_image (numpy.ndarray): Gambar kedua (2D), ukurannya sama.
+    win_size (int): Ukuran jendela seragam (ganjil); diabaikan jika gaussian=True.
+    gaussian (bool): Pakai jendela gaussian.
+    data_range (float): Rentang nilai piksel.
+    scratch (dict): Buffer dari ssim_scratch untuk dipakai ulang (opsional).
+
+    Pengembalian:
+    float: Nilai SSIM antara -1 dan 1
+    """
+    if gaussian:
+        win_size = GAUSSIAN_WIN_SIZE
+    if min(x_image.shape) < win_size:
+        raise ValueError("image is smaller than the SSIM window")
+
+    buf = ssim_scratch(x_image.shape, scratch)
+    x, y, tmp = buf['x'], buf['y'], buf['tmp']
+    ux, uy, uxx, uyy, uxy = buf['ux'], buf['uy'], buf['uxx'], buf['uyy'], buf['uxy']
+    np.copyto(x, x_image, casting='unsafe')
+    np.copyto(y, y_image, casting='unsafe')
+
+    # Varians dihitung sebagai E[x^2] - E[x]^2; pada gambar terang berkontras rendah pengurangan ini kehilangan
+    # presisi float32. Kedua gambar digeser dengan konstanta yang sama (rata-rata gambar) sehingga varians dan
+    # kovarians tidak berubah, dan rata-rata lokal dikembalikan lagi sebelum suku luminans
+    shift = float(x.mean(dtype=np.float64))
+    x -= shift
+    y -= shift
+
+    # Rata-rata lokal berbobot; tepi tidak berpengaruh karena dipotong di akhir
+    ksize = (win_size, win_size)
+    def blur(src, dst):
+        if gaussian:
+            cv2.GaussianBlur(src, ksize, GAUSSIAN_SIGMA, dst=dst, borderType=cv2.BORDER_REFLECT)
+        else:
+            cv2.boxFilter(src, -1, ksize, dst=dst, normalize=True, borderType=cv2.BORDER_REFLECT)
+
+    np.multiply(x, x, out=tmp)
+    blur(tmp, uxx)
+    np.multiply(y, y, out=tmp)
+    blur(tmp, uyy)
+    np.multiply(x, y, out=tmp)
+    blur(tmp, uxy)
+    blur(x, ux)
+    blur(y, uy)
+
+    # Varians dan kovarians; skimage memakai kovarians sampel hanya untuk jendela seragam
+    cov_norm = 1.0 if gaussian else win_size ** 2 / (win_size ** 2 - 1)
+    c1 = (K1 * data_range) ** 2
+    c2 = (K2 * data_range) ** 2
+    np.multiply(ux, ux, out=tmp)
+    uxx -= tmp
+    uxx *= cov_norm
+    np.multiply(uy, uy, out=tmp)
+    uyy -= tmp
+    uyy *= cov_norm
+    np.multiply(ux, uy, out=tmp)
+    uxy -= tmp
+    uxy *= cov_norm
+    ux += shift
+    uy += shift
+    np.multiply(ux, uy, out=tmp)
+
+    # S = (2 ux uy + C1)(2 vxy + C2) / ((ux^2 + uy^2 + C1)(vx + vy + C2)), disimpan di x
+    np.multiply(tmp, 2, out=x)
+    x += c1
+    uxy *= 2
+    uxy += c2
+    x *= uxy
+    ux *= ux
+    uy *= uy
+    ux += uy
+    ux += c1
+    uxx += uyy
+    uxx += c2
+    ux *= uxx
+    x /= ux
+
+    # Tepi yang jendelanya keluar dari gambar tidak dihitung
+    pad = (win_size - 1) // 2
+    return float(x[pad:x.shape[0] - pad, pad:x.shape[1] - pad].mean(dtype=np.float64))
+
+def calculate_ssim(original_image, stego_image, channels=False, roi=None, preview=None, gaussian=False):
     """
     Hitung Indeks Kesamaan Struktural (SSIM) antara dua gambar.
 
     Argumen:
     original_image (numpy.ndarray): Gambar asli.
     stego_image (numpy.ndarray): Gambar stego (yang dimodifikasi).
+    channels (bool): Hitung SSIM setiap channel warna lalu dirata-ratakan
+                     (seperti channel_axis=-1 di skimage), bukan dari grayscale.
+    roi (tuple): Hanya bandingkan area (x, y, lebar, tinggi) dalam piksel.
+    preview (float): Perkecil kedua gambar dengan faktor ini (misalnya 0.25) sebelum
+                     dihitung, untuk perkiraan cepat pada gambar besar.
+    gaussian (bool): Pakai jendela gaussian 11x11 (sigma 1.5) alih-alih seragam 7x7.
 
     Pengembalian:
     float: Nilai SSIM antara -1 dan 1
     """
-    # Convert to grayscale
-    original_gray = cv2.cvtColor(original_image, cv2.COLOR_BGR2GRAY)
-    stego_gray = cv2.cvtColor(stego_image, cv2.COLOR_BGR2GRAY)
+    if original_image.shape != stego_image.shape:
+        raise ValueError("Images must have the same dimensions")
+
+    if roi is not None:
+        x, y, width, height = roi
+        original_image = original_image[y:y + height, x:x + width]
+        stego_image = stego_image[y:y + height, x:x + width]
+
+    if preview is not None:
+        original_image = cv2.resize(original_image, None, fx=preview, fy=preview, interpolation=cv2.INTER_AREA)
+        stego_image = cv2.resize(stego_image, None, fx=preview, fy=preview, interpolation=cv2.INTER_AREA)
+
+    if original_image.ndim == 2:
+        return structural_similarity(original_image, stego_image, gaussian=gaussian)
+
+    if not channels:
+        # Convert to grayscale
+        original_gray = cv2.cvtColor(original_image, cv2.COLOR_BGR2GRAY)
+        stego_gray = cv2.cvtColor(stego_image, cv2.COLOR_BGR2GRAY)
+        return structural_similarity(original_gray, stego_gray, gaussian=gaussian)
+
+    # Buffer yang sama dipakai untuk semua channel
+    scratch = None
+    values = []
+    for channel in range(original_image.shape[2]):
+        scratch = ssim_scratch(original_image.shape[:2], scratch)
+        values.append(structural_similarity(original_image[..., channel], stego_image[..., channel],
+                                            gaussian=gaussian, scratch=scratch))
+    return float(np.mean(values))
+
+if __name__ == "__main__":
+    # Bandingkan dengan skimage (opsional, hanya untuk verifikasi)
+    try:
+        from skimage.metrics import structural_similarity as skimage_ssim
+    except ImportError:
+        print("scikit-image not installed, skipping comparison")
+        sys.exit(0)
+
+    original = cv2.imread('original.png')
+    stego = cv2.imread('stego.png')
+    if original is None or stego is None:
+        # Pasangan gambar sintetis jika file contoh tidak ada
+        rng = np.random.default_rng(0)
+        original = cv2.GaussianBlur(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8), (5, 5), 0)
+        stego = np.clip(original + rng.normal(0, 3, original.shape), 0, 255).astype(np.uint8)
+
+    original_gray = cv2.cvtColor(original, cv2.COLOR_BGR2GRAY)
+    stego_gray = cv2.cvtColor(stego, cv2.COLOR_BGR2GRAY)
+    checks = [
+        ("grayscale", calculate_ssim(original, stego), skimage_ssim(original_gray, stego_gray)),
+        ("gaussian", calculate_ssim(original, stego, gaussian=True),
+         skimage_ssim(original_gray, stego_gray, gaussian_weights=True, sigma=GAUSSIAN_SIGMA,
+                      use_sample_covariance=False)),
+        ("channels", calculate_ssim(original, stego, channels=True),
+         skimage_ssim(original, stego, channel_axis=2)),
+    ]
 
-    # Hitung SSIM
-    ssim_value, _ = ssim(original_gray, stego_gray, full=True)
-    return ssim_value
+    tolerance = 1e-5
+    for name, value, expected in checks:
+        status = "OK" if abs(value - expected) <= tolerance else "MISMATCH"
+        print(f"{name:<10} native {value:.8f} skimage {expected:.8f} {status}")